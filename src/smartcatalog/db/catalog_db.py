@@ -3,12 +3,24 @@ from __future__ import annotations
 
 import sqlite3
 import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Callable, Dict, Optional, List, Tuple
 
 from smartcatalog.state import CatalogItem
 
 
+_DASH_TBL = str.maketrans({"–": "-", "—": "-"})
+
+
+@lru_cache(maxsize=200_000)
+def normalize_code_soft(s: str) -> str:
+    """Code as matched loosely: weird dashes fixed + all whitespace removed (stored in items.code_norm)."""
+    if s is None:
+        return ""
+    return "".join(str(s).translate(_DASH_TBL).split())
+
+
 SCHEMA_SQL = """
 PRAGMA foreign_keys = ON;
 
@@ -90,12 +102,15 @@ class CatalogDB:
     - Each thread should use its own connection (connect()).
     """
 
+    RESOLVE_BATCH = 500  # codes per `IN (...)` query; stays under SQLite's 999-variable limit
+
     def __init__(self, db_path: str | Path, data_dir: Optional[str | Path] = None):
         self.db_path = str(db_path)
         self.data_dir: Optional[Path] = Path(data_dir).resolve() if data_dir else None
 
         conn = self.connect()
         try:
+            self._enable_wal(conn)
             self._ensure_schema(conn)
             self._ensure_columns(conn)  # migration safety for old DBs
         finally:
@@ -153,6 +168,17 @@ class CatalogDB:
         conn.execute("PRAGMA foreign_keys = ON;")
         return conn
 
+    def _enable_wal(self, conn: sqlite3.Connection) -> None:
+        """
+        WAL is persistent in the DB file: bulk writes (Excel import, PDF build) commit
+        without blocking readers and with fewer fsyncs. Best-effort; some filesystems
+        (e.g. network shares) don't support it and we keep the default journal.
+        """
+        try:
+            conn.execute("PRAGMA journal_mode=WAL;")
+        except sqlite3.DatabaseError:
+            pass
+
     def _ensure_schema(self, conn: sqlite3.Connection) -> None:
         conn.executescript(SCHEMA_SQL)
         conn.commit()
@@ -176,6 +202,8 @@ class CatalogDB:
             "pdf_path": "TEXT NOT NULL DEFAULT ''",
             "validated": "INTEGER NOT NULL DEFAULT 0",
             "validated_at": "TEXT NOT NULL DEFAULT ''",
+            # normalize_code_soft(code); NULL until refresh_code_norm() fills it
+            "code_norm": "TEXT",
         }
         cur = conn.cursor()
         for col, ddl in cols.items():
@@ -183,6 +211,18 @@ class CatalogDB:
                 cur.execute(f"ALTER TABLE items ADD COLUMN {col} {ddl}")
             except sqlite3.OperationalError:
                 pass
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_items_code_norm ON items(code_norm)")
+        # plain SQL (no Python function), so any writer or external tool keeps it consistent
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_items_code_norm_reset
+            AFTER UPDATE OF code ON items
+            WHEN NEW.code IS NOT OLD.code
+            BEGIN
+              UPDATE items SET code_norm = NULL WHERE id = NEW.id;
+            END
+            """
+        )
         conn.commit()
 
     # ==========================================================================================
@@ -377,6 +417,118 @@ class CatalogDB:
             if owns:
                 conn.close()
 
+    def refresh_code_norm(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Fill items.code_norm for rows that don't have it yet. New rows start NULL and a
+        trigger resets it when code changes, so only rows written since the last call
+        are touched. Returns the number of rows updated.
+        """
+        owns = conn is None
+        if conn is None:
+            conn = self.connect()
+            self._ensure_schema(conn)
+            self._ensure_columns(conn)
+
+        try:
+            rows = conn.execute("SELECT id, code FROM items WHERE code_norm IS NULL").fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE items SET code_norm=? WHERE id=?",
+                    [(normalize_code_soft(r["code"]), int(r["id"])) for r in rows],
+                )
+                conn.commit()
+            return len(rows)
+        finally:
+            if owns:
+                conn.close()
+
+    def resolve_item_code(self, code: str, conn: Optional[sqlite3.Connection] = None) -> Optional[Tuple[int, str]]:
+        """
+        (item_id, db_code) for an external code:
+        1) exact code match
+        2) code_norm match -> only if exactly one item has it
+        Call refresh_code_norm() first so recently written rows are indexed.
+        """
+        owns = conn is None
+        if conn is None:
+            conn = self.connect()
+
+        try:
+            r = conn.execute("SELECT id, code FROM items WHERE code=?", (code,)).fetchone()
+            if r:
+                return int(r["id"]), str(r["code"])
+            rows = conn.execute(
+                "SELECT id, code FROM items WHERE code_norm=? LIMIT 2",
+                (normalize_code_soft(code),),
+            ).fetchall()
+            if len(rows) != 1:
+                return None
+            return int(rows[0]["id"]), str(rows[0]["code"])
+        finally:
+            if owns:
+                conn.close()
+
+    def resolve_item_codes(
+        self,
+        codes: List[str],
+        conn: Optional[sqlite3.Connection] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Optional[Tuple[int, str]]]:
+        """
+        Batch form of resolve_item_code(): {code: (item_id, db_code) | None}.
+        Exact hits are looked up with one `code IN (...)` query per RESOLVE_BATCH codes;
+        only the misses go through the code_norm lookup (unique matches only).
+        on_progress(settled, total) is called after every batch; settled counts codes
+        whose result is final (exact hits, then each batch of the normalized pass).
+        """
+        owns = conn is None
+        if conn is None:
+            conn = self.connect()
+
+        try:
+            codes = list(dict.fromkeys(codes))
+            total = len(codes)
+            out: Dict[str, Optional[Tuple[int, str]]] = {}
+            step = self.RESOLVE_BATCH
+
+            for i in range(0, total, step):
+                chunk = codes[i:i + step]
+                rows = conn.execute(
+                    f"SELECT id, code FROM items WHERE code IN ({','.join('?' * len(chunk))}) ORDER BY id",
+                    chunk,
+                ).fetchall()
+                for r in rows:
+                    out.setdefault(str(r["code"]), (int(r["id"]), str(r["code"])))
+                if on_progress:
+                    on_progress(len(out), total)
+
+            # normalized pass for the misses: a code_norm shared by several items is ambiguous
+            by_norm: Dict[str, List[str]] = {}
+            for code in codes:
+                if code not in out:
+                    by_norm.setdefault(normalize_code_soft(code), []).append(code)
+            norms = list(by_norm)
+            for i in range(0, len(norms), step):
+                chunk = norms[i:i + step]
+                rows = conn.execute(
+                    f"SELECT id, code, code_norm FROM items WHERE code_norm IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                hits: Dict[str, List[Tuple[int, str]]] = {}
+                for r in rows:
+                    hits.setdefault(str(r["code_norm"]), []).append((int(r["id"]), str(r["code"])))
+                for norm in chunk:
+                    found = hits.get(norm, [])
+                    hit = found[0] if len(found) == 1 else None
+                    for code in by_norm[norm]:
+                        out[code] = hit
+                if on_progress:
+                    on_progress(len(out), total)
+            return out
+        finally:
+            if owns:
+                conn.close()
+
     # ==========================================================================================
     # New: Assets + Links (foundation for manual assignment later)
     # ==========================================================================================
@@ -492,6 +644,66 @@ class CatalogDB:
             if owns:
                 conn.close()
 
+    def add_image_paths(
+        self,
+        *,
+        item_id: int,
+        paths: List[str],
+        pdf_path: str = "",
+        page: int = 0,
+        source: str = "add",
+        sha256s: Optional[List[str]] = None,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> List[int]:
+        """
+        Attach image files to an item in ONE transaction:
+        insert missing assets (dedup key = (pdf_path, page, asset_path)) and link them (idempotent).
+        Item fields and existing links are left untouched.
+        Returns asset_ids in input order.
+        """
+        owns = conn is None
+        if conn is None:
+            conn = self.connect()
+            self._ensure_schema(conn)
+            self._ensure_columns(conn)
+
+        try:
+            pdf_db = self.to_db_path(pdf_path)
+            asset_ids: List[int] = []
+            for i, p in enumerate(paths):
+                asset_db = self.to_db_path(p)
+                row = conn.execute(
+                    "SELECT id FROM assets WHERE pdf_path=? AND page=? AND asset_path=?",
+                    (pdf_db, int(page), asset_db),
+                ).fetchone()
+                if row:
+                    asset_id = int(row["id"])
+                else:
+                    sha256 = sha256s[i] if sha256s and i < len(sha256s) else ""
+                    cur = conn.execute(
+                        """
+                        INSERT INTO assets(pdf_path, page, asset_path, x0, y0, x1, y1, source, sha256)
+                        VALUES(?,?,?,?,?,?,?,?,?)
+                        """,
+                        (pdf_db, int(page), asset_db, None, None, None, None, source, sha256),
+                    )
+                    asset_id = int(cur.lastrowid)
+
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO item_asset_links(item_id, asset_id, match_method, score, verified, is_primary)
+                    VALUES(?,?,?,?,?,?)
+                    """,
+                    (int(item_id), asset_id, "manual", None, 1, 0),
+                )
+                asset_ids.append(asset_id)
+
+            conn.commit()
+            return asset_ids
+        finally:
+            if owns:
+                conn.close()
+
     def unlink_asset_from_item(
         self,
         *,
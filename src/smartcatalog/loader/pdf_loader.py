@@ -26,8 +26,14 @@ def _ui_call(widget_or_root: Any, fn: Callable[[], None]) -> None:
 
 
 def _set_preview_text(source_preview, text: str) -> None:
+    if source_preview is None:
+        return
+
     def _do():
         try:
+            # kept for logging only; skip the Tk round-trips while it isn't shown
+            if not source_preview.winfo_ismapped():
+                return
             source_preview.configure(state="normal")
             source_preview.delete("1.0", "end")
             source_preview.insert("1.0", text)
@@ -39,6 +45,16 @@ def _set_preview_text(source_preview, text: str) -> None:
 
 
 def _set_status(status_var, text: str) -> None:
+    """
+    status_var is either a Tk variable or a thread-safe callable(text), e.g. a
+    coalescing status pump that only shows the latest text a few times per second.
+    """
+    if status_var is None:
+        return
+    if callable(status_var):
+        status_var(text)
+        return
+
     def _do():
         try:
             status_var.set(text)
@@ -218,7 +234,7 @@ def _save_image_bytes_as_png(image_bytes: bytes, out_path: Path) -> None:
 def build_or_update_db_from_pdf(
     state: AppState,
     source_preview=None,
-    status_message=None,
+    status_message: Any = None,
     *,
     page_start: int = 1,
     page_end: Optional[int] = None,
@@ -349,20 +365,21 @@ def build_or_update_db_from_pdf(
 
             if page_no % 10 == 0:
                 _set_status(status_message, f"Đã xử lý trang {page_no}/{end_idx+1} | sản phẩm đã cập nhật: {inserted}")
-                _set_preview_text(
-                    source_preview,
-                    f"Trang {page_no}\n"
-                    f"Tìm thấy {len(items)} mã sản phẩm\n"
-                    f"Ảnh đã gán: {images_added}\n"
-                    f"Bỏ qua (đã kiểm duyệt): {skipped_validated}\n"
-                    f"Bỏ qua (đã có ảnh Excel): {skipped_excel}\n"
-                    f"Giữ nguyên mã đã có: {skipped_existing}\n\n"
-                    f"Ví dụ:\n"
-                    + "\n".join([
-                        f"- {it.code}: {it.category} | {it.author} | {it.small_description} | {it.dimension}"
-                        for it in items[:8]
-                    ])
-                )
+                if source_preview is not None:
+                    _set_preview_text(
+                        source_preview,
+                        f"Trang {page_no}\n"
+                        f"Tìm thấy {len(items)} mã sản phẩm\n"
+                        f"Ảnh đã gán: {images_added}\n"
+                        f"Bỏ qua (đã kiểm duyệt): {skipped_validated}\n"
+                        f"Bỏ qua (đã có ảnh Excel): {skipped_excel}\n"
+                        f"Giữ nguyên mã đã có: {skipped_existing}\n\n"
+                        f"Ví dụ:\n"
+                        + "\n".join([
+                            f"- {it.code}: {it.category} | {it.author} | {it.small_description} | {it.dimension}"
+                            for it in items[:8]
+                        ])
+                    )
 
         _set_status(
             status_message,
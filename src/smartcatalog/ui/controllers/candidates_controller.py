@@ -4,6 +4,7 @@ from __future__ import annotations
 import io
 import threading
 import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -14,6 +15,21 @@ from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 import fitz  # PyMuPDF
 
+from smartcatalog.ui.photo import ppm_photo
+from smartcatalog.ui.widgets.scrollable_frame import WheelScroller
+
+
+def _decode_page_image(data: bytes, size: tuple[int, int]) -> Optional[Image.Image]:
+    """Decode + downscale embedded image bytes (pure PIL, safe off the Tk thread)."""
+    try:
+        pil = Image.open(io.BytesIO(data))
+        pil.draft("RGB", size)
+        pil = pil.convert("RGBA")
+        pil.thumbnail(size, Image.Resampling.BILINEAR)
+        return pil
+    except Exception:
+        return None
+
 
 @dataclass
 class PageImage:
@@ -35,6 +51,8 @@ class CandidatesControllerMixin:
     - Click an image to select, then click Thêm to save into assets + link to selected item
     """
 
+    CAND_THUMB_CACHE_MAX = 256
+
     # ----------------------------
     # UI build (called by main_window)
     # ----------------------------
@@ -75,6 +93,8 @@ class CandidatesControllerMixin:
 
         # Keep PhotoImage refs (avoid GC)
         self._cand_photo_refs: list[ImageTk.PhotoImage] = []
+        # decoded thumbnails, reused across reflows (selection highlight / resize)
+        self._cand_thumb_cache: OrderedDict[tuple[str, int, int, int, int], tk.PhotoImage] = OrderedDict()
 
         # Async + cache state
         self._page_images_cache: dict[tuple[str, int], list[PageImage]] = {}
@@ -98,9 +118,19 @@ class CandidatesControllerMixin:
 
         # resize debounce
         self._cand_reflow_after_id: Optional[str] = None
+        self._cand_scrollregion_job: Optional[str] = None
+
+        def _update_scrollregion():
+            self._cand_scrollregion_job = None
+            # inner frame is the only canvas item: its requested size is the extent
+            self._cand_canvas.configure(
+                scrollregion=(0, 0, self._cand_inner.winfo_reqwidth(), self._cand_inner.winfo_reqheight())
+            )
 
         def _on_inner_configure(_evt=None):
-            self._cand_canvas.configure(scrollregion=self._cand_canvas.bbox("all"))
+            # coalesce bursts of child resizes (one per thumbnail) into one update
+            if self._cand_scrollregion_job is None:
+                self._cand_scrollregion_job = self._cand_canvas.after_idle(_update_scrollregion)
 
         def _on_canvas_configure(evt):
             # keep inner width equal to visible width
@@ -110,6 +140,7 @@ class CandidatesControllerMixin:
 
         self._cand_inner.bind("<Configure>", _on_inner_configure)
         self._cand_canvas.bind("<Configure>", _on_canvas_configure)
+        WheelScroller(self._cand_canvas, self._cand_canvas)
 
         ttk.Label(self._cand_inner, text="Chọn sản phẩm/trang để tải ảnh.").pack(anchor="w", pady=4)
 
@@ -145,21 +176,25 @@ class CandidatesControllerMixin:
             try:
                 images = self._extract_images_from_pdf_page_cached(pdf_path, page_index)
                 self._page_images_cache[key] = images  # cache even if empty
-                self._safe_ui(lambda: self._apply_page_images_result(token, key, images))
+                self._safe_ui(self._apply_page_images_result, token, key, images)
             except Exception as e:
-                self._safe_ui(lambda: self._apply_page_images_error(token, key, e))
+                self._safe_ui(self._apply_page_images_error, token, key, e)
 
         threading.Thread(target=worker, daemon=True).start()
 
     # ----------------------------
     # UI helpers
     # ----------------------------
-    def _safe_ui(self, fn) -> None:
+    def _safe_ui(self, fn, *args) -> None:
+        post_ui = getattr(self, "_post_ui", None)
+        if callable(post_ui):
+            post_ui(fn, *args)
+            return
         root = getattr(self, "root", None)
         if root is not None:
-            root.after(0, fn)
+            root.after(0, fn, *args)
         else:
-            fn()
+            fn(*args)
 
     def _apply_page_images_result(self, token: int, key: tuple[str, int], images: list[PageImage]) -> None:
         if token != self._cand_job_token:
@@ -285,7 +320,7 @@ class CandidatesControllerMixin:
         r = 0
         c = 0
         for img in images:
-            tk_img = self._make_thumb(img, (thumb_w, thumb_h))
+            tk_img, pending = self._make_thumb(img, (thumb_w, thumb_h))
 
             is_selected = self._cand_selected_key == (img.page_index, img.xref)
             cell = ttk.Frame(
@@ -298,8 +333,10 @@ class CandidatesControllerMixin:
             img_btn = ttk.Button(
                 cell,
                 image=tk_img if tk_img is not None else "",
-                text="" if tk_img is not None else "X",
+                text="" if tk_img is not None else ("…" if pending else "X"),
             )
+            if pending:
+                self._cand_install_thumb_async(img_btn, img, (thumb_w, thumb_h))
             img_btn.pack(fill="both", expand=False)
             img_btn.bind("<ButtonPress-1>", lambda e, im=img: self._on_drag_start(e, im))
             img_btn.bind("<B1-Motion>", self._on_drag_motion)
@@ -313,13 +350,55 @@ class CandidatesControllerMixin:
                 c = 0
                 r += 1
 
-    def _make_thumb(self, img: PageImage, size: tuple[int, int]) -> Optional[ImageTk.PhotoImage]:
-        try:
-            pil = Image.open(io.BytesIO(img.bytes_)).convert("RGBA")
-            pil.thumbnail(size)
-            return ImageTk.PhotoImage(pil)
-        except Exception:
+    def _cand_thumb_key(self, img: PageImage, size: tuple[int, int]) -> tuple[str, int, int, int, int]:
+        pdf_key = self._cand_current_key[0] if self._cand_current_key else ""
+        return (pdf_key, img.page_index, img.xref, size[0], size[1])
+
+    def _make_thumb(self, img: PageImage, size: tuple[int, int]) -> tuple[Optional[tk.PhotoImage], bool]:
+        """
+        Return (photo, pending). A cache miss is decoded on the shared thumbnail
+        pool when there is one (pending=True, see _cand_install_thumb_async),
+        otherwise synchronously.
+        """
+        key = self._cand_thumb_key(img, size)
+        cached = self._cand_thumb_cache.get(key)
+        if cached is not None:
+            self._cand_thumb_cache.move_to_end(key)
+            return cached, False
+        if getattr(self, "_thumb_pool", None) is not None:
+            return None, True
+        return self._cand_store_thumb(key, _decode_page_image(img.bytes_, size)), False
+
+    def _cand_store_thumb(self, key: tuple, pil: Optional[Image.Image]) -> Optional[tk.PhotoImage]:
+        if pil is None:
             return None
+        tk_img = ppm_photo(pil)
+        self._cand_thumb_cache[key] = tk_img
+        while len(self._cand_thumb_cache) > self.CAND_THUMB_CACHE_MAX:
+            self._cand_thumb_cache.popitem(last=False)
+        return tk_img
+
+    def _cand_install_thumb_async(self, btn: ttk.Button, img: PageImage, size: tuple[int, int]) -> None:
+        key = self._cand_thumb_key(img, size)
+        fut = self._thumb_pool.submit(_decode_page_image, img.bytes_, size)
+        fut.add_done_callback(
+            lambda f: self._safe_ui(self._cand_place_thumb, btn, key, f.result())
+        )
+
+    def _cand_place_thumb(self, btn: ttk.Button, key: tuple, pil: Optional[Image.Image]) -> None:
+        # PhotoImage construction stays on the Tk thread; the cache is filled even
+        # if the page changed meanwhile, a later visit reuses it
+        tk_img = self._cand_thumb_cache.get(key) or self._cand_store_thumb(key, pil)
+        try:
+            if not btn.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        if tk_img is None:
+            btn.configure(text="X")
+            return
+        self._cand_photo_refs.append(tk_img)
+        btn.configure(image=tk_img, text="")
 
     def _on_select_page_image(self, img: PageImage) -> None:
         self._cand_selected_key = (img.page_index, img.xref)
@@ -383,7 +462,7 @@ class CandidatesControllerMixin:
 
         try:
             pil = Image.open(io.BytesIO(img.bytes_)).convert("RGBA")
-            pil.thumbnail((96, 96))
+            pil.thumbnail((96, 96), Image.Resampling.BILINEAR)
             self._cand_drag_ghost_img = ImageTk.PhotoImage(pil)
         except Exception:
             self._cand_drag_ghost_img = None
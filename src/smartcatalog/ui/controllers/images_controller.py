@@ -6,12 +6,72 @@ import os
 import shutil
 import hashlib
 import time
+import threading
+from collections import OrderedDict
 from typing import Optional
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-from PIL import Image, ImageTk
+from PIL import Image
+
+from smartcatalog.ui.photo import flatten_rgb, ppm_photo
+
+
+_THUMB_CLICK_TAG = "SmartCatalogThumb"
+
+
+def _decode_thumb(image_path: str, size: tuple[int, int]) -> Optional[Image.Image]:
+    """
+    Open + downscale + flatten one thumbnail. Pure PIL, safe to run in a worker
+    thread (PIL releases the GIL while decoding/resampling).
+    """
+    try:
+        with Image.open(image_path) as pil:
+            # JPEG: let the decoder downscale by 1/2..1/8 while decoding
+            pil.draft("RGB", size)
+            pil = pil.convert("RGBA")
+            # BILINEAR is indistinguishable from LANCZOS at grid size and much cheaper
+            pil.thumbnail(size, Image.Resampling.BILINEAR)
+            return flatten_rgb(pil)
+    except Exception:
+        return None
+
+
+_THUMB_CACHE_MAX = 512
+_thumb_cache: "OrderedDict[tuple[str, int, int, int], Optional[Image.Image]]" = OrderedDict()
+_thumb_cache_lock = threading.Lock()
+
+
+def _thumb_key(image_path: str, size: tuple[int, int]) -> Optional[tuple[str, int, int, int]]:
+    """(path, mtime_ns, w, h); a rewritten file gets a new key. None if the file is gone."""
+    try:
+        mtime_ns = os.stat(image_path).st_mtime_ns
+    except OSError:
+        return None
+    return (image_path, mtime_ns, int(size[0]), int(size[1]))
+
+
+def _thumb_cache_get(key: tuple[str, int, int, int]) -> tuple[bool, Optional[Image.Image]]:
+    with _thumb_cache_lock:
+        if key not in _thumb_cache:
+            return False, None
+        _thumb_cache.move_to_end(key)
+        return True, _thumb_cache[key]
+
+
+def _decode_thumb_cached(key: tuple[str, int, int, int]) -> Optional[Image.Image]:
+    """Worker-side decode that fills the LRU (stores PIL images, never PhotoImages)."""
+    hit, pil = _thumb_cache_get(key)
+    if hit:
+        return pil
+    pil = _decode_thumb(key[0], (key[2], key[3]))
+    with _thumb_cache_lock:
+        _thumb_cache[key] = pil
+        _thumb_cache.move_to_end(key)
+        while len(_thumb_cache) > _THUMB_CACHE_MAX:
+            _thumb_cache.popitem(last=False)
+    return pil
 
 
 class ImagesControllerMixin:
@@ -28,18 +88,51 @@ class ImagesControllerMixin:
       - self.thumb_inner (Frame)
       - self.image_preview_label (Label)
       - self._thumb_refs: list[PhotoImage]
+      - self._thumb_path_by_widget: dict[str, str] (set by _install_thumb_click_handler)
+      - self._thumb_pool (ThreadPoolExecutor), self._thumb_render_token: int
+      - self._thumb_photo_cache: OrderedDict[key, PhotoImage] (Tk thread only)
+      - self._post_ui(fn, *args) (thread-safe hand-off to the Tk thread)
       - self._full_img_ref: PhotoImage | None
       - self._selected_image_path: str | None
       - self.refresh_items(), self._reload_selected_into_form(), self._set_status()
     """
 
+    THUMB_PHOTO_CACHE_MAX = 256
+
     # ----------------------------
     # Thumbnails rendering
     # ----------------------------
+    def _install_thumb_click_handler(self) -> None:
+        """
+        One click handler for the whole grid: every thumbnail widget carries the
+        _THUMB_CLICK_TAG bindtag and is resolved through self._thumb_path_by_widget.
+        The tag sits after the TButton class, so ttk's own press/release handling
+        (pressed look, drag-off cancel, Space) runs first.
+        """
+        self._thumb_path_by_widget = {}
+        self.thumb_inner.bind_class(_THUMB_CLICK_TAG, "<ButtonRelease-1>", self._on_thumb_click)
+        self.thumb_inner.bind_class(_THUMB_CLICK_TAG, "<Key-space>", self._on_thumb_click)
+
+    def _on_thumb_click(self, e):
+        w = e.widget
+        path = self._thumb_path_by_widget.get(str(w))
+        if path is None:
+            return None
+        # like a button command: a press dragged off the thumbnail is not a click
+        if e.type == tk.EventType.ButtonRelease and not (
+            0 <= e.x < w.winfo_width() and 0 <= e.y < w.winfo_height()
+        ):
+            return None
+        self._on_select_thumbnail(path)
+        return None
+
     def _clear_thumbnails(self) -> None:
+        # decodes still in flight belong to the old grid
+        self._thumb_render_token += 1
         for w in self.thumb_inner.winfo_children():
             w.destroy()
         self._thumb_refs.clear()
+        self._thumb_path_by_widget.clear()
         self._full_img_ref = None
         self._selected_image_path = None
         if hasattr(self, "image_preview_label"):
@@ -117,34 +210,36 @@ class ImagesControllerMixin:
         key = os.path.normcase(os.path.normpath(image_path))
         badge = _badge_text(source_map.get(key, ""))
 
-        # Load thumb
-        tk_img = None
-        try:
-            with Image.open(image_path) as pil:
-                pil = pil.convert("RGBA")
-                pil.thumbnail(size)
-                tk_img = ImageTk.PhotoImage(pil)
-        except Exception:
-            tk_img = None
-
-        if tk_img is not None:
-            self._thumb_refs.append(tk_img)
-
-            btn = ttk.Button(
-                cell,
-                image=tk_img,
-                command=lambda p=image_path: self._on_select_thumbnail(p),
-            )
-            btn.pack()
+        # Placeholder now; the image is decoded on the thumb pool and placed later.
+        btn = ttk.Button(cell, text="Đang tải…", width=14)
+        tags = btn.bindtags()  # (widget, TButton, toplevel, all)
+        btn.bindtags(tags[:2] + (_THUMB_CLICK_TAG,) + tags[2:])
+        self._thumb_path_by_widget[str(btn)] = image_path
+        btn.pack()
+
+        token = self._thumb_render_token
+        cache_key = _thumb_key(image_path, size)
+        photo = self._thumb_photo_cache.get(cache_key) if cache_key is not None else None
+        if photo is not None:
+            # decoded and uploaded to Tk before: reuse the PhotoImage as-is
+            self._thumb_photo_cache.move_to_end(cache_key)
+            self._thumb_refs.append(photo)
+            btn.configure(image=photo, width=0)
+            return self._pack_thumb_badge(cell, badge)
+
+        hit, pil = _thumb_cache_get(cache_key) if cache_key is not None else (True, None)
+        if hit:
+            # already decoded (re-render on click / reselect): place without a round-trip
+            self._place_thumbnail(btn, token, pil, cache_key)
         else:
-            btn = ttk.Button(
-                cell,
-                text="[Không xem được]",
-                width=14,
-                command=lambda p=image_path: self._on_select_thumbnail(p),
+            fut = self._thumb_pool.submit(_decode_thumb_cached, cache_key)
+            fut.add_done_callback(
+                lambda f: self._post_ui(self._place_thumbnail, btn, token, f.result(), cache_key)
             )
-            btn.pack()
 
+        self._pack_thumb_badge(cell, badge)
+
+    def _pack_thumb_badge(self, cell: ttk.Frame, badge: str) -> None:
         if badge:
             b = ttk.Label(
                 cell,
@@ -154,6 +249,25 @@ class ImagesControllerMixin:
             )
             b.pack(pady=(2, 0))
 
+    def _place_thumbnail(
+        self,
+        btn: ttk.Button,
+        token: int,
+        pil: Optional[Image.Image],
+        cache_key: Optional[tuple[str, int, int, int]] = None,
+    ) -> None:
+        if token != self._thumb_render_token or not btn.winfo_exists():
+            return
+        if pil is None:
+            btn.configure(text="[Không xem được]")
+            return
+        tk_img = ppm_photo(pil)
+        if cache_key is not None:
+            self._thumb_photo_cache[cache_key] = tk_img
+            while len(self._thumb_photo_cache) > self.THUMB_PHOTO_CACHE_MAX:
+                self._thumb_photo_cache.popitem(last=False)
+        self._thumb_refs.append(tk_img)
+        btn.configure(image=tk_img, width=0)
 
     def _on_select_thumbnail(self, image_path: str) -> None:
         self._selected_image_path = image_path
@@ -187,7 +301,7 @@ class ImagesControllerMixin:
             with Image.open(image_path) as pil:
                 pil = pil.convert("RGBA")
                 pil.thumbnail((max_w, max_h))
-                self._full_img_ref = ImageTk.PhotoImage(pil)
+                self._full_img_ref = ppm_photo(pil)
             self.image_preview_label.configure(image=self._full_img_ref)
         except Exception:
             self.image_preview_label.configure(image="")
@@ -198,7 +312,7 @@ class ImagesControllerMixin:
     # ----------------------------
     def on_add_image(self) -> None:
         """
-        Add an external image file path to the selected item via assets + links.
+        Add external image files to the selected item via assets + links.
         """
         if not self._selected:
             code = ""
@@ -231,8 +345,7 @@ class ImagesControllerMixin:
                     self._selected = match
                     try:
                         if hasattr(self, "items_tree"):
-                            self.items_tree.selection_set(str(match.id))
-                            self.items_tree.focus(str(match.id))
+                            self._select_in_tree(match.id)
                     except Exception:
                         pass
                     try:
@@ -248,88 +361,91 @@ class ImagesControllerMixin:
                 messagebox.showwarning("Chưa chọn", "Vui lòng thêm hoặc chọn sản phẩm trước.")
                 return
 
-        path = filedialog.askopenfilename(
+        picked = filedialog.askopenfilenames(
             title="Chọn ảnh",
             filetypes=[("Tệp ảnh", "*.png *.jpg *.jpeg *.webp *.bmp"), ("Tất cả tệp", "*.*")],
         )
-        if not path:
+        if not picked:
             return
 
-        # Copy into assets folder (new scheme) for portability and collision avoidance
-        pdf_path = ""
         page = int(getattr(self._selected, "page", 0) or 0)
-        try:
-            data_dir = getattr(self.state, "data_dir", None)
-            if data_dir:
-                assets_dir = Path(data_dir) / "assets" / "manual_import"
-                assets_dir.mkdir(parents=True, exist_ok=True)
-
-                src = Path(path)
-                ext = src.suffix or ".png"
-
-                pdf_path = str(getattr(self._selected, "pdf_path", "") or "")
-                if not pdf_path and getattr(self.state, "catalog_pdf_path", None):
-                    pdf_path = str(self.state.catalog_pdf_path)
-
-                pdf_stem = Path(pdf_path).stem if pdf_path else "pdf"
-                safe_stem = "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in pdf_stem)
-                pdf_key_src = pdf_path or "nopdf"
-                pdf_key = hashlib.sha256(pdf_key_src.encode("utf-8")).hexdigest()[:8]
-                xref = int(time.time() * 1000)
-
-                base = f"{safe_stem}_{pdf_key}_page{page:04d}_xref{xref}"
-                dest = assets_dir / f"{base}{ext.lower()}"
-                i = 1
-                while dest.exists():
-                    dest = assets_dir / f"{base}_{i}{ext.lower()}"
-                    i += 1
-
-                shutil.copy2(str(src), str(dest))
-                path = str(dest)
-        except Exception:
-            # Fallback: keep original path
-            pass
+        # the asset's pdf_path (part of its dedup key) is only recorded for copies
+        # made under data_dir; external paths kept as-is are stored with pdf_path=""
+        pdf_path = ""
+        if getattr(self.state, "data_dir", None):
+            pdf_path = str(getattr(self._selected, "pdf_path", "") or "")
+            if not pdf_path and getattr(self.state, "catalog_pdf_path", None):
+                pdf_path = str(self.state.catalog_pdf_path)
+
+        # Copy into assets folder (new scheme) for portability and collision avoidance
+        paths = [self._copy_into_manual_import(p, pdf_path, page) for p in picked]
 
         if self.state.db:
             try:
-                sha256 = ""
-                try:
-                    h = hashlib.sha256()
-                    with open(path, "rb") as f:
-                        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                            h.update(chunk)
-                    sha256 = h.hexdigest()
-                except Exception:
-                    sha256 = ""
-
-                asset_id = self.state.db.upsert_asset(
+                # only the new images are written (one transaction), rest of the item is untouched
+                self.state.db.add_image_paths(
+                    item_id=int(self._selected.id),
+                    paths=paths,
                     pdf_path=pdf_path,
                     page=page,
-                    asset_path=path,
-                    bbox=None,
                     source="add",
-                    sha256=sha256,
-                )
-                self.state.db.link_asset_to_item(
-                    item_id=int(self._selected.id),
-                    asset_id=int(asset_id),
-                    match_method="manual",
-                    score=None,
-                    verified=True,
-                    is_primary=False,
+                    sha256s=[self._file_sha256(p) for p in paths],
                 )
                 self._selected.images = self.state.db.list_asset_paths_for_item(int(self._selected.id))
             except Exception:
                 # Fallback: keep legacy in-memory only
-                self._selected.images = list(self._selected.images or [])
-                self._selected.images.append(path)
+                self._selected.images = list(self._selected.images or []) + paths
         else:
-            self._selected.images = list(self._selected.images or [])
-            self._selected.images.append(path)
+            self._selected.images = list(self._selected.images or []) + paths
 
         self.refresh_items()
         self._reload_selected_into_form()
-        self._set_status("✅ Đã thêm ảnh")
+        self._set_status(f"✅ Đã thêm {len(paths)} ảnh")
+
+    def _copy_into_manual_import(self, path: str, pdf_path: str, page: int) -> str:
+        """
+        Copy an external image into assets/manual_import; returns the new path
+        (or the original path if copying fails).
+        """
+        try:
+            data_dir = getattr(self.state, "data_dir", None)
+            if not data_dir:
+                return path
+            assets_dir = Path(data_dir) / "assets" / "manual_import"
+            assets_dir.mkdir(parents=True, exist_ok=True)
+
+            src = Path(path)
+            ext = src.suffix or ".png"
+
+            pdf_stem = Path(pdf_path).stem if pdf_path else "pdf"
+            safe_stem = "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in pdf_stem)
+            pdf_key_src = pdf_path or "nopdf"
+            pdf_key = hashlib.sha256(pdf_key_src.encode("utf-8")).hexdigest()[:8]
+            xref = int(time.time() * 1000)
+
+            base = f"{safe_stem}_{pdf_key}_page{page:04d}_xref{xref}"
+            dest = assets_dir / f"{base}{ext.lower()}"
+            i = 1
+            while dest.exists():
+                dest = assets_dir / f"{base}_{i}{ext.lower()}"
+                i += 1
+
+            shutil.copy2(str(src), str(dest))
+            return str(dest)
+        except Exception:
+            # Fallback: keep original path
+            return path
+
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        try:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            return h.hexdigest()
+        except Exception:
+            return ""
 
     def on_remove_selected_thumbnail(self) -> None:
         """
@@ -367,8 +483,7 @@ class ImagesControllerMixin:
         # 3) Refresh UI + keep selection highlight (avoid full refresh for speed)
         try:
             if hasattr(self, "items_tree"):
-                self.items_tree.selection_set(str(item_id))
-                self.items_tree.focus(str(item_id))
+                self._select_in_tree(item_id)
         except Exception:
             pass
         self._reload_selected_into_form()
@@ -398,8 +513,7 @@ class ImagesControllerMixin:
         # Refresh thumbnails + preview without losing selection
         try:
             if hasattr(self, "items_tree") and getattr(self._selected, "id", None):
-                self.items_tree.selection_set(str(self._selected.id))
-                self.items_tree.focus(str(self._selected.id))
+                self._select_in_tree(self._selected.id)
         except Exception:
             pass
 
@@ -23,9 +23,10 @@ class ItemFormControllerMixin:
       - self.description_vietnames_from_excel_text (ScrolledText)
       - self._set_preview_text(), self._set_status()
       - self.items_tree (Treeview)
+      - self._build_right_panel_lazy() (images/page-images sections are built on first use)
       - thumbnail methods: _render_thumbnails(), _clear_thumbnails()
       - page images method: _render_candidates_for_page(page_index_0based)
-      - refresh_items()
+      - refresh_items(), _item_by_id()
     """
 
     def _reload_selected_into_form(self) -> None:
@@ -33,6 +34,8 @@ class ItemFormControllerMixin:
         if not it:
             return
 
+        self._build_right_panel_lazy()
+
         # Basic fields
         self.var_code.set(it.code or "")
         self.var_page.set("" if it.page is None else str(it.page))
@@ -73,7 +76,9 @@ class ItemFormControllerMixin:
                 # Candidates view should never crash the whole selection
                 pass
 
-        # Preview text (debug panel)
+        # Preview text (debug panel) - only worth formatting when a preview widget exists
+        if getattr(self, "source_preview", None) is None:
+            return
         img_lines = "\n".join([f"- {p}" for p in (it.images or [])[:8]])
         if it.images and len(it.images) > 8:
             img_lines += f"\n... ({len(it.images) - 8} more)"
@@ -270,13 +275,12 @@ class ItemFormControllerMixin:
 
         # Select the new item in the tree + reload form.
         try:
-            new_item = next((x for x in self.state.items_cache if x.id == item_id), None)
+            new_item = self._item_by_id(item_id)
             if new_item is None:
                 new_item = self.state.db.get_item_by_code(code)
             self._selected = new_item
             if new_item and hasattr(self, "items_tree"):
-                self.items_tree.selection_set(str(new_item.id))
-                self.items_tree.focus(str(new_item.id))
+                self._select_in_tree(new_item.id)
             self._update_pdf_tools_label()
             self._reload_selected_into_form()
         except Exception:
@@ -1,10 +1,43 @@
 from __future__ import annotations
 
 from datetime import datetime
+from operator import attrgetter, itemgetter
 from pathlib import Path
+from typing import Any, Callable, Optional
 from smartcatalog.state import CatalogItem
 
 
+def _lower_attr(name: str) -> Callable[[CatalogItem], str]:
+    return lambda it: (getattr(it, name, "") or "").lower()
+
+
+def _no_sort_key(_it: CatalogItem) -> str:
+    return ""
+
+
+_item_id = attrgetter("id")
+_first = itemgetter(0)
+_second = itemgetter(1)
+
+# column -> sort key; keys are computed once per column per loaded items_cache
+_SORT_KEY_FNS: dict[str, Callable[[CatalogItem], Any]] = {
+    "id": lambda it: it.id,
+    "code": lambda it: (it.code or "").lower(),
+    "page": lambda it: (it.page is None, it.page if it.page is not None else 0),
+    "category": _lower_attr("category"),
+    "shape": _lower_attr("shape"),
+    "blade_tip": _lower_attr("blade_tip"),
+    "surface_treatment": _lower_attr("surface_treatment"),
+    "material": _lower_attr("material"),
+    "author": _lower_attr("author"),
+    "dimension": _lower_attr("dimension"),
+    "validated": lambda it: (
+        1 if getattr(it, "validated", False) else 0,
+        str(getattr(it, "validated_at", "") or ""),
+    ),
+}
+
+
 class ItemsControllerMixin:
     """
     Items list behavior:
@@ -18,12 +51,23 @@ class ItemsControllerMixin:
       - self.items_tree (Treeview)
       - self.search_var (StringVar)
       - self._selected (CatalogItem | None)
+      - self._build_right_panel_lazy()
       - self._reload_selected_into_form()
       - self._set_status()
       - self._update_pdf_tools_label()
       - sort state fields: self._sort_col, self._sort_desc
+      - self._heading_texts (column -> heading text last set); heading commands are bound by the builder
+      - tree fill state: self._tree_fill_token, self._tree_pending, self._tree_pending_pos,
+        self._tree_fill_scheduled, self._items_yscroll (the tree's vertical Scrollbar)
+      - filter caches: self._search_blobs, self._row_values, self._items_by_id, self._item_caches_for
+      - sort key cache: self._sort_keys (column -> {item id: key})
+      - filter debounce: self._filter_after_id, self._filter_applied_q
     """
 
+    TREE_FILL_BATCH = 500
+    TREE_FILL_PREFETCH = 0.9  # load the next batch once the view bottom passes this fraction
+    FILTER_DEBOUNCE_MS = 150
+
     @staticmethod
     def _format_validated_at_vi(raw: str) -> str:
         s = str(raw or "").strip()
@@ -43,14 +87,17 @@ class ItemsControllerMixin:
         self._filter_items()
         self._set_status(f"Đã tải {len(self.state.items_cache)} sản phẩm")
 
-    def _filter_items(self) -> None:
-        q = (self.search_var.get() or "").strip().lower()
-
-        for row in self.items_tree.get_children():
-            self.items_tree.delete(row)
-
+    def _rebuild_item_caches(self) -> None:
+        """
+        Precompute, once per loaded items_cache, the lowercase search text and the
+        Treeview row values of every item so filtering is a plain substring scan.
+        """
+        blobs: dict[int, str] = {}
+        row_values: dict[int, tuple] = {}
+        by_id: dict[int, CatalogItem] = {}
         for it in self.state.items_cache:
-            text = (
+            by_id[it.id] = it
+            blobs[it.id] = (
                 f"{it.id} {it.code} {it.page or ''} "
                 f"{getattr(it,'category','')} {getattr(it,'shape','')} {getattr(it,'blade_tip','')} "
                 f"{getattr(it,'surface_treatment','')} {getattr(it,'material','')} "
@@ -59,29 +106,121 @@ class ItemsControllerMixin:
                 f"{'✅' if getattr(it, 'validated', False) else ''} {getattr(it, 'validated_at', '')}"
             ).lower()
 
-            if q and q not in text:
-                continue
-
             validated_at = self._format_validated_at_vi(getattr(it, "validated_at", ""))
-            self.items_tree.insert(
-                "",
-                "end",
-                iid=str(it.id),
-                values=(
-                    it.id,
-                    it.code,
-                    "" if it.page is None else it.page,
-                    getattr(it, "category", ""),
-                    getattr(it, "author", ""),
-                    getattr(it, "shape", ""),
-                    getattr(it, "blade_tip", ""),
-                    getattr(it, "dimension", ""),
-                    getattr(it, "surface_treatment", ""),
-                    getattr(it, "material", ""),
-                    validated_at if getattr(it, "validated", False) else "",
-                ),
+            row_values[it.id] = (
+                it.id,
+                it.code,
+                "" if it.page is None else it.page,
+                getattr(it, "category", ""),
+                getattr(it, "author", ""),
+                getattr(it, "shape", ""),
+                getattr(it, "blade_tip", ""),
+                getattr(it, "dimension", ""),
+                getattr(it, "surface_treatment", ""),
+                getattr(it, "material", ""),
+                validated_at if getattr(it, "validated", False) else "",
             )
 
+        self._search_blobs = blobs
+        self._row_values = row_values
+        self._items_by_id = by_id
+        self._sort_keys = {}
+        self._item_caches_for = self.state.items_cache
+
+    def _item_by_id(self, item_id: int) -> Optional[CatalogItem]:
+        """O(1) lookup into the current items_cache."""
+        if self._item_caches_for is not self.state.items_cache:
+            self._rebuild_item_caches()
+        return self._items_by_id.get(int(item_id))
+
+    def _on_search_key(self, _e=None) -> None:
+        """<KeyRelease> on search_entry: collapse a burst of keystrokes into one filter pass."""
+        if self._filter_after_id is not None:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(self.FILTER_DEBOUNCE_MS, self._run_scheduled_filter)
+
+    def _run_scheduled_filter(self) -> None:
+        self._filter_after_id = None
+        q = (self.search_var.get() or "").strip().lower()
+        # arrows / modifiers / trailing spaces don't change the result
+        if q == self._filter_applied_q:
+            return
+        self._filter_items()
+
+    def _filter_items(self) -> None:
+        if self._filter_after_id is not None:
+            self.root.after_cancel(self._filter_after_id)
+            self._filter_after_id = None
+
+        q = (self.search_var.get() or "").strip().lower()
+        self._filter_applied_q = q
+
+        children = self.items_tree.get_children()
+        if children:
+            self.items_tree.delete(*children)
+
+        # items_cache is replaced (not mutated) on refresh; sorting keeps ids stable
+        if self._item_caches_for is not self.state.items_cache:
+            self._rebuild_item_caches()
+        blobs = self._search_blobs
+        row_values = self._row_values
+
+        rows: list[tuple[str, tuple]] = [
+            (str(it.id), row_values[it.id])
+            for it in self.state.items_cache
+            if not q or q in blobs[it.id]
+        ]
+
+        # Only the first batch is inserted now; the rest is materialized as the user
+        # scrolls toward the end (_on_items_tree_yscroll), so Tk never lays out rows
+        # nobody looks at. A newer filter/refresh bumps the token and abandons the old fill.
+        self._tree_fill_token += 1
+        self._tree_pending = rows
+        self._tree_pending_pos = 0
+        self._fill_tree_batch(self._tree_fill_token)
+
+    def _fill_tree_batch(self, token: int) -> None:
+        self._tree_fill_scheduled = False
+        if token != self._tree_fill_token:
+            return
+        rows = self._tree_pending
+        start = self._tree_pending_pos
+        end = min(len(rows), start + self.TREE_FILL_BATCH)
+        for iid, values in rows[start:end]:
+            self.items_tree.insert("", "end", iid=iid, values=values)
+        self._tree_pending_pos = end
+
+    def _on_items_tree_yscroll(self, first: str, last: str) -> None:
+        """yscrollcommand of items_tree: forward to the scrollbar, top up rows near the end."""
+        self._items_yscroll.set(first, last)
+        if (
+            not self._tree_fill_scheduled
+            and self._tree_pending_pos < len(self._tree_pending)
+            and float(last) >= self.TREE_FILL_PREFETCH
+        ):
+            self._tree_fill_scheduled = True
+            self.root.after_idle(self._fill_tree_batch, self._tree_fill_token)
+
+    def _flush_tree_fill(self, upto_iid: Optional[str] = None) -> None:
+        """Insert rows still pending, all of them or just through upto_iid."""
+        rows = self._tree_pending
+        start = self._tree_pending_pos
+        end = len(rows)
+        if upto_iid is not None:
+            end = next((i + 1 for i in range(start, len(rows)) if rows[i][0] == upto_iid), start)
+        for iid, values in rows[start:end]:
+            self.items_tree.insert("", "end", iid=iid, values=values)
+        self._tree_pending_pos = end
+
+    def _select_in_tree(self, item_id: int) -> None:
+        """Select + focus an item row, making sure it has been inserted first."""
+        iid = str(item_id)
+        if not self.items_tree.exists(iid):
+            self._flush_tree_fill(upto_iid=iid)
+        if self.items_tree.exists(iid):
+            self.items_tree.selection_set(iid)
+            self.items_tree.focus(iid)
+
     def _sort_by(self, col: str) -> None:
         # toggle direction
         if self._sort_col == col:
@@ -90,35 +229,20 @@ class ItemsControllerMixin:
             self._sort_col = col
             self._sort_desc = False
 
-        def key_fn(it: CatalogItem):
-            if col == "id":
-                return it.id
-            if col == "code":
-                return (it.code or "").lower()
-            if col == "page":
-                return (it.page is None, it.page if it.page is not None else 0)
-            if col == "category":
-                return (getattr(it, "category", "") or "").lower()
-            if col == "shape":
-                return (getattr(it, "shape", "") or "").lower()
-            if col == "blade_tip":
-                return (getattr(it, "blade_tip", "") or "").lower()
-            if col == "surface_treatment":
-                return (getattr(it, "surface_treatment", "") or "").lower()
-            if col == "material":
-                return (getattr(it, "material", "") or "").lower()
-            if col == "author":
-                return (getattr(it, "author", "") or "").lower()
-            if col == "dimension":
-                return (getattr(it, "dimension", "") or "").lower()
-            if col == "validated":
-                return (
-                    1 if getattr(it, "validated", False) else 0,
-                    str(getattr(it, "validated_at", "") or ""),
-                )
-            return ""
+        if self._item_caches_for is not self.state.items_cache:
+            self._rebuild_item_caches()
+        keys = self._sort_keys.get(col)
+        if keys is None:
+            key_fn = _SORT_KEY_FNS.get(col, _no_sort_key)
+            keys = {it.id: key_fn(it) for it in self.state.items_cache}
+            self._sort_keys[col] = keys
 
-        self.state.items_cache.sort(key=key_fn, reverse=self._sort_desc)
+        # decorate-sort-undecorate with operator getters: every per-item step runs in C.
+        # Slice assignment keeps items_cache identity, so the per-item caches stay valid.
+        items = self.state.items_cache
+        decorated = list(zip(map(keys.__getitem__, map(_item_id, items)), items))
+        decorated.sort(key=_first, reverse=self._sort_desc)
+        items[:] = map(_second, decorated)
 
         self._update_sort_headers()
         self._filter_items()
@@ -150,11 +274,11 @@ class ItemsControllerMixin:
         for col in cols:
             label = labels.get(col, col.upper())
             arrow = arrows[self._sort_desc] if col == self._sort_col else arrows[None]
-            self.items_tree.heading(
-                col,
-                text=f"{label}{arrow}",
-                command=lambda c=col: self._sort_by(c),
-            )
+            text = f"{label}{arrow}"
+            # usually only the old and the new sort column change
+            if self._heading_texts.get(col) != text:
+                self._heading_texts[col] = text
+                self.items_tree.heading(col, text=text)
 
     def _on_select_item(self, _evt=None) -> None:
         sel = self.items_tree.selection()
@@ -168,8 +292,7 @@ class ItemsControllerMixin:
 
         item_id = int(vals[0])
 
-        # Find item object in cache
-        it = next((x for x in self.state.items_cache if int(x.id) == item_id), None)
+        it = self._item_by_id(item_id)
         if not it:
             return
 
@@ -182,6 +305,7 @@ class ItemsControllerMixin:
         except Exception:
             pass
 
+        self._build_right_panel_lazy()
         self._update_pdf_tools_label()
         self._reload_selected_into_form()
 
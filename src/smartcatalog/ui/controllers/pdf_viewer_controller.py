@@ -19,7 +19,7 @@ class PdfViewerControllerMixin:
       - self.state (with catalog_pdf_path, data_dir, db)
       - self.pdf_canvas, self.pdf_info_label
       - self._selected (CatalogItem-like with .id, .page)
-      - self.refresh_items(), self._reload_selected_into_form(), self._set_status()
+      - self.refresh_items(), self._item_by_id(), self._reload_selected_into_form(), self._set_status()
       - PDF state fields:
           self._pdf_doc, self._pdf_page_index, self._pdf_zoom
           self._pdf_page_img_ref, self._pdf_page_pil
@@ -211,7 +211,7 @@ class PdfViewerControllerMixin:
             set_primary(item_id=int(it.id), asset_id=int(asset_id))
 
         self.refresh_items()
-        self._selected = next((x for x in self.state.items_cache if x.id == it.id), it)
+        self._selected = self._item_by_id(it.id) or it
         self._reload_selected_into_form()
 
         self._set_status("✅ Cropped region saved + assigned to item")
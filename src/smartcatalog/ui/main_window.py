@@ -2,20 +2,23 @@
 from __future__ import annotations
 
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import io
 import traceback
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 from pathlib import Path
-from typing import Callable, Optional, TYPE_CHECKING
+from typing import Callable, Iterable, Optional, TYPE_CHECKING
 import sqlite3
 import shutil
 import datetime
 if TYPE_CHECKING:
     from PIL import Image, ImageTk
 from smartcatalog.state import AppState, CatalogItem
+from smartcatalog.db.catalog_db import normalize_code_soft
 from smartcatalog.loader.pdf_loader import build_or_update_db_from_pdf
-from smartcatalog.ui.widgets.scrollable_frame import ScrollableFrame
+from smartcatalog.ui.widgets.scrollable_frame import ScrollableFrame, WheelScroller
 from smartcatalog.ui.controllers.candidates_controller import CandidatesControllerMixin
 from smartcatalog.ui.controllers.images_controller import ImagesControllerMixin
 from smartcatalog.ui.controllers.items_controller import ItemsControllerMixin
@@ -26,19 +29,14 @@ from smartcatalog.ui.pdf_crop_window import PdfCropWindow
 import re
 import hashlib
 from bisect import bisect_right
-def _normalize_code_soft(s: str) -> str:
-    if s is None:
-        return ""
-    s = str(s).strip()
-    s = s.replace("–", "-").replace("—", "-")
-    s = re.sub(r"\s+", "", s)  # remove all spaces
-    return s
+from collections import Counter, OrderedDict
+from collections.abc import Set as AbstractSet
+from functools import partial
+
 
 def _normalize_header_text(s: str) -> str:
-    s = str(s or "").strip().lower()
-    s = s.replace("\n", " ")
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    # lowercase + collapse any whitespace run (incl. newlines) to one space
+    return " ".join(str(s or "").lower().split())
 
 
 def _sanitize_filename(s: str) -> str:
@@ -78,24 +76,19 @@ def _image_to_pil(img) -> Optional[Image.Image]:
         return None
     return None
 
-def _build_db_code_index(db_codes: list[str]) -> dict[str, str]:
+def _build_db_code_index(db_codes: Iterable[str]) -> dict[str, str]:
     """
     normalized_code -> original_db_code
     only keep unique mappings to avoid wrong updates.
     """
-    buckets: dict[str, list[str]] = {}
-    for c in db_codes:
-        key = _normalize_code_soft(c)
-        buckets.setdefault(key, []).append(c)
-
-    index: dict[str, str] = {}
-    for k, vals in buckets.items():
-        if len(vals) == 1:
-            index[k] = vals[0]
-    return index
-
-def _safe_ui(root: tk.Misc, fn: Callable[[], None]) -> None:
-    root.after(0, fn)
+    # map/Counter/zip keep both passes in C; repeated identical codes aren't ambiguous.
+    # Callers pass the keys view of their code->id/item map (already unique), so the
+    # exact-match set costs no pass of its own and only plain iterables need dedup.
+    # Sets/dicts iterate in the same order twice, so no list copy of the codes is kept.
+    codes = db_codes if isinstance(db_codes, AbstractSet) else dict.fromkeys(db_codes)
+    keys = list(map(normalize_code_soft, codes))
+    counts = Counter(keys)
+    return {k: c for k, c in zip(keys, codes) if counts[k] == 1}
 
 
 class MainWindow(
@@ -105,7 +98,11 @@ class MainWindow(
                     ImagesControllerMixin,
                     ItemFormControllerMixin,
                 ):
-    ...
+    UI_DRAIN_MS = 30
+    UI_DRAIN_MAX = 50
+    STATUS_PUMP_MS = 100
+    STATUS_FLASH_MS = 2500
+    THUMB_WORKERS = 4
 
     def __init__(self, root: tk.Tk, state: Optional[AppState] = None):
         super().__init__(root, padding=10)
@@ -115,9 +112,36 @@ class MainWindow(
 
         self._sort_col: str = "id"
         self._sort_desc: bool = False
+        self._heading_texts: dict[str, str] = {}
+
+        # chunked items_tree population (see ItemsControllerMixin._filter_items)
+        self._tree_fill_token: int = 0
+        self._tree_pending: list[tuple[str, tuple]] = []
+        self._tree_pending_pos: int = 0
+        self._tree_fill_scheduled: bool = False
+
+        # per-item search text / row values (see ItemsControllerMixin._rebuild_item_caches)
+        self._search_blobs: dict[int, str] = {}
+        self._row_values: dict[int, tuple] = {}
+        self._items_by_id: dict[int, CatalogItem] = {}
+        self._sort_keys: dict[str, dict[int, object]] = {}
+        self._filter_after_id: Optional[str] = None
+        self._filter_applied_q: Optional[str] = None
+        self._item_caches_for: Optional[list[CatalogItem]] = None
 
         self.status_message = tk.StringVar(value="Chưa tải dữ liệu")
         self._busy = tk.BooleanVar(value=False)
+        # last state pushed to the widgets + the widgets themselves (see _apply_busy)
+        self._busy_applied: bool = False
+        self._busy_widgets: Optional[tuple[str, ...]] = None
+
+        # UI callables posted by worker threads, drained on the Tk thread
+        self._ui_queue: queue.SimpleQueue[tuple[Callable[..., None], tuple]] = queue.SimpleQueue()
+
+        # latest progress text from workers, shown by _pump_status
+        self._status_latest: str = ""
+        self._status_pump_started: bool = False
+        self._status_flash_job: Optional[str] = None
 
         # form vars
         self.var_code = tk.StringVar()
@@ -136,11 +160,20 @@ class MainWindow(
         self.var_export_desc_vi = tk.BooleanVar(value=False)
 
         self._thumb_refs: list[ImageTk.PhotoImage] = []
+        # thumbnail decode/resize runs here; only PhotoImage creation touches Tk
+        self._thumb_pool = ThreadPoolExecutor(max_workers=self.THUMB_WORKERS, thread_name_prefix="thumb")
+        self._thumb_render_token: int = 0
+        self._thumb_photo_cache: OrderedDict[tuple, ImageTk.PhotoImage] = OrderedDict()
         self._full_img_ref: Optional[ImageTk.PhotoImage] = None
         self._selected_image_path: Optional[str] = None
         self.var_export_images_in_ui_order = tk.BooleanVar(value=False)
 
         self._selected: Optional[CatalogItem] = None
+
+        # cached pdf_tools_label inputs (see _update_pdf_tools_label)
+        self._pdf_basename_src: object = None
+        self._pdf_basename: str = ""
+        self._pdf_tools_text: str = ""
         
 
         self._build_layout()
@@ -151,6 +184,7 @@ class MainWindow(
         self._build_status_bar()
 
         self.root.after(0, self.refresh_items)
+        self.root.after(self.UI_DRAIN_MS, self._drain_ui_queue)
 
     # -----------------
     # Layout
@@ -201,9 +235,18 @@ class MainWindow(
         self.panes.add(self.left_pane, weight=1)
         self.panes.add(self.right_pane, weight=3)
 
-        # Scrollable container inside right pane
-        self.right_scroll = ScrollableFrame(self.right_pane)
-        self.right_scroll.pack(fill="both", expand=True)
+        # Right pane: editor (tall form, own scroll) over the media sections.
+        # Images / page images already scroll inside their own canvases, so they sit
+        # directly in a pane instead of one big ScrollableFrame that re-lays-out
+        # every section on each resize.
+        self.right_split = ttk.PanedWindow(self.right_pane, orient="vertical")
+        self.right_split.pack(fill="both", expand=True)
+
+        self.right_scroll = ScrollableFrame(self.right_split)
+        self.right_media = ttk.Frame(self.right_split)
+
+        self.right_split.add(self.right_scroll, weight=1)
+        self.right_split.add(self.right_media, weight=2)
 
 
     def _build_left_panel(self) -> None:
@@ -214,7 +257,7 @@ class MainWindow(
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         self.search_entry.pack(side="left", fill="x", expand=True, padx=6)
-        self.search_entry.bind("<KeyRelease>", lambda _e: self._filter_items())
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
 
         list_frame = ttk.LabelFrame(self.left_pane, text="📦 Sản phẩm", padding=6)
         list_frame.pack(fill="both", expand=True)
@@ -233,17 +276,9 @@ class MainWindow(
             "validated",
         )
         self.items_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=18)
-        self.items_tree.heading("id", command=lambda: self._sort_by("id"))
-        self.items_tree.heading("code",command=lambda: self._sort_by("code"))
-        self.items_tree.heading("page", command=lambda: self._sort_by("page"))
-        self.items_tree.heading("category", command=lambda: self._sort_by("category"))
-        self.items_tree.heading("author", command=lambda: self._sort_by("author"))
-        self.items_tree.heading("shape", command=lambda: self._sort_by("shape"))
-        self.items_tree.heading("blade_tip", command=lambda: self._sort_by("blade_tip"))
-        self.items_tree.heading("dimension", command=lambda: self._sort_by("dimension"))
-        self.items_tree.heading("surface_treatment", command=lambda: self._sort_by("surface_treatment"))
-        self.items_tree.heading("material", command=lambda: self._sort_by("material"))
-        self.items_tree.heading("validated", command=lambda: self._sort_by("validated"))
+        # commands are registered once here; _update_sort_headers only touches heading text
+        for col in columns:
+            self.items_tree.heading(col, command=partial(self._sort_by, col))
 
         self.items_tree.column("id", width=40, anchor="center", stretch=False)
         self.items_tree.column("code", width=90, anchor="w", stretch=False)
@@ -259,7 +294,8 @@ class MainWindow(
 
         yscroll = ttk.Scrollbar(list_frame, orient="vertical", command=self.items_tree.yview)
         xscroll = ttk.Scrollbar(list_frame, orient="horizontal", command=self.items_tree.xview)
-        self.items_tree.configure(yscrollcommand=yscroll.set)
+        self._items_yscroll = yscroll
+        self.items_tree.configure(yscrollcommand=self._on_items_tree_yscroll)
         self.items_tree.configure(xscrollcommand=xscroll.set)
 
         # Use grid to keep scrollbars aligned with the treeview
@@ -273,9 +309,20 @@ class MainWindow(
         self._update_sort_headers()
 
     def _build_right_panel(self) -> None:
-        parent = self.right_scroll.inner
+        # Editor is needed up front (add-item form + busy buttons);
+        # images/page-images are built on first selection (_build_right_panel_lazy).
+        self._build_item_editor_section(self.right_scroll.inner)
+        self._right_built = False
+        self._right_placeholder = ttk.Label(self.right_media, text="Chọn sản phẩm để xem ảnh.")
+        self._right_placeholder.pack(anchor="w", pady=(8, 0))
+
+    def _build_right_panel_lazy(self) -> None:
+        if self._right_built:
+            return
+        self._right_built = True
+        parent = self.right_media
 
-        self._build_item_editor_section(parent)
+        self._right_placeholder.destroy()
         self._build_images_section(parent)
         self._build_candidates_section_simple(parent)
 
@@ -363,7 +410,7 @@ class MainWindow(
 
         def after_save():
             self.refresh_items()
-            self._selected = next((x for x in self.state.items_cache if x.id == self._selected.id), self._selected)
+            self._selected = self._item_by_id(self._selected.id) or self._selected
             self._reload_selected_into_form()
 
             if self._selected and getattr(self._selected, "page", None):
@@ -391,16 +438,21 @@ class MainWindow(
             return
 
         if not pdf:
-            self.pdf_tools_label.configure(text="Chưa chọn PDF")
-            return
-
-        pdf_name = Path(pdf).name if not isinstance(pdf, Path) else pdf.name
-        page = getattr(it, "page", None) if it else None
-
-        if page:
-            self.pdf_tools_label.configure(text=f"PDF: {pdf_name} | Trang: {page}")
+            text = "Chưa chọn PDF"
         else:
-            self.pdf_tools_label.configure(text=f"PDF: {pdf_name} | (chọn sản phẩm)")
+            # catalog_pdf_path is reassigned from several places; re-derive the name only when it changes
+            if pdf is not self._pdf_basename_src:
+                self._pdf_basename_src = pdf
+                self._pdf_basename = Path(pdf).name if not isinstance(pdf, Path) else pdf.name
+            page = getattr(it, "page", None) if it else None
+            if page:
+                text = f"PDF: {self._pdf_basename} | Trang: {page}"
+            else:
+                text = f"PDF: {self._pdf_basename} | (chọn sản phẩm)"
+
+        if text != self._pdf_tools_text:
+            self._pdf_tools_text = text
+            self.pdf_tools_label.configure(text=text)
 
 
     def _build_images_section(self, parent) -> None:
@@ -419,11 +471,23 @@ class MainWindow(
 
         self.thumb_inner = ttk.Frame(self.thumb_canvas)
         self.thumb_canvas.create_window((0, 0), window=self.thumb_inner, anchor="nw")
+        self._thumb_scrollregion_job: Optional[str] = None
+
+        def _update_thumb_scrollregion():
+            self._thumb_scrollregion_job = None
+            # thumb_inner is the only canvas item: its requested size is the extent
+            self.thumb_canvas.configure(
+                scrollregion=(0, 0, self.thumb_inner.winfo_reqwidth(), self.thumb_inner.winfo_reqheight())
+            )
 
         def _on_thumb_inner_configure(_e=None):
-            self.thumb_canvas.configure(scrollregion=self.thumb_canvas.bbox("all"))
+            # coalesce bursts of child resizes (one per thumbnail) into one update
+            if self._thumb_scrollregion_job is None:
+                self._thumb_scrollregion_job = self.thumb_canvas.after_idle(_update_thumb_scrollregion)
 
         self.thumb_inner.bind("<Configure>", _on_thumb_inner_configure)
+        self._install_thumb_click_handler()
+        WheelScroller(self.thumb_canvas, self.thumb_canvas)
 
         right_col = ttk.Frame(images_frame)
         right_col.pack(side="left", fill="y", padx=(10, 0))
@@ -460,6 +524,7 @@ class MainWindow(
 
         self.status_bar = ttk.Label(bar, textvariable=self.status_message, anchor="w")
         self.status_bar.pack(side="left")
+        ttk.Style(self).configure("Flash.TLabel", background="#fff3b0")
 
         self._apply_busy(False)
 
@@ -468,11 +533,22 @@ class MainWindow(
     # -----------------
 
     def _apply_busy(self, busy: bool) -> None:
+        busy = bool(busy)
         self._busy.set(busy)
-        for w in (self.btn_build_pdf, self.btn_refresh, self.btn_match_excel, self.btn_search_images,
-                  self.btn_search_images_opts,
-                  self.btn_save, self.btn_add_item, self.btn_delete_item, self.btn_backup):
-            w.configure(state=("disabled" if busy else "normal"))
+        # _run_bg posts busy on/off per job; repeated calls shouldn't re-touch every widget
+        if busy == self._busy_applied:
+            return
+        self._busy_applied = busy
+
+        if self._busy_widgets is None:
+            # Tcl path names, so the whole group is toggled by one interpreter call
+            self._busy_widgets = tuple(str(w) for w in (
+                self.btn_build_pdf, self.btn_refresh, self.btn_match_excel, self.btn_search_images,
+                self.btn_search_images_opts,
+                self.btn_save, self.btn_add_item, self.btn_delete_item, self.btn_backup,
+            ))
+        state = "disabled" if busy else "normal"
+        self.tk.call("foreach", "w", self._busy_widgets, f"$w configure -state {state}")
         if busy:
             self._close_search_options_popup()
 
@@ -482,8 +558,41 @@ class MainWindow(
             self.progress.stop()
 
     def _set_status(self, msg: str) -> None:
+        # an explicit status wins over any pending progress text
+        self._status_latest = ""
         self.status_message.set(msg)
 
+    def _flash_status(self, msg: str) -> None:
+        """Show a job summary in the status bar, highlighted for STATUS_FLASH_MS (non-modal)."""
+        self._set_status(msg)
+        self.status_bar.configure(style="Flash.TLabel")
+        if self._status_flash_job is not None:
+            self.root.after_cancel(self._status_flash_job)
+        self._status_flash_job = self.root.after(self.STATUS_FLASH_MS, self._end_status_flash)
+
+    def _end_status_flash(self) -> None:
+        self._status_flash_job = None
+        self.status_bar.configure(style="TLabel")
+
+    def _push_status(self, msg: str) -> None:
+        """
+        Worker-safe progress update: only stores the latest text.
+        The Tk thread polls it every STATUS_PUMP_MS while busy.
+        """
+        self._status_latest = msg
+        if not self._status_pump_started:
+            self._status_pump_started = True
+            self._post_ui(self._pump_status)
+
+    def _pump_status(self) -> None:
+        msg = self._status_latest
+        if msg and msg != self.status_message.get():
+            self.status_message.set(msg)
+        if self._busy.get():
+            self.root.after(self.STATUS_PUMP_MS, self._pump_status)
+        else:
+            self._status_pump_started = False
+
     def _set_preview_text(self, text: str) -> None:
         """
         Legacy no-op to keep controller calls safe after removing preview widget.
@@ -570,21 +679,46 @@ class MainWindow(
             return
         self._close_search_options_popup()
 
+    def _post_ui(self, fn: Callable[..., None], *args) -> None:
+        """
+        Queue fn(*args) to run on the Tk thread (safe to call from worker threads).
+        Pass a bound method + args rather than wrapping it in a lambda.
+        """
+        self._ui_queue.put((fn, args))
+
+    def _drain_ui_queue(self) -> None:
+        # reschedule first so a modal dialog opened by a callback doesn't stall the queue
+        self.root.after(self.UI_DRAIN_MS, self._drain_ui_queue)
+        for _ in range(self.UI_DRAIN_MAX):
+            try:
+                fn, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                return
+            fn(*args)
+
+    def _bg_started(self, title: str) -> None:
+        self._apply_busy(True)
+        self._set_status(title)
+
+    def _bg_failed(self, status: str, err_text: str) -> None:
+        self._apply_busy(False)
+        self._set_status(status)
+        messagebox.showerror("Lỗi", err_text)
+
     def _run_bg(self, title: str, work: Callable[[], None]) -> None:
         def runner():
             try:
-                _safe_ui(self.root, lambda: (self._apply_busy(True), self._set_status(title)))
+                self._post_ui(self._bg_started, title)
                 work()
-                _safe_ui(self.root, lambda: self._apply_busy(False))
+                self._post_ui(self._apply_busy, False)
             except Exception as exc:
                 tb = traceback.format_exc()
 
                 # ✅ capture strings now
+                status = f"❌ Lỗi: {exc}"
                 err_text = f"{exc}\n\n{tb}"
 
-                _safe_ui(self.root, lambda: self._apply_busy(False))
-                _safe_ui(self.root, lambda: self._set_status(f"❌ Lỗi: {exc}"))
-                _safe_ui(self.root, lambda msg=err_text: messagebox.showerror("Lỗi", msg))
+                self._post_ui(self._bg_failed, status, err_text)
 
         threading.Thread(target=runner, daemon=True).start()
 
@@ -624,7 +758,7 @@ class MainWindow(
             if not path:
                 return
             self.state.set_catalog_pdf(path)
-            _safe_ui(self.root, self._update_pdf_tools_label)
+            self._post_ui(self._update_pdf_tools_label)
             self._set_status(f"Đã chọn PDF: {path}")
         else:
             path = str(self.state.catalog_pdf_path)
@@ -660,7 +794,7 @@ class MainWindow(
                     result["apply_all"] = bool(apply_all)
                     done.set()
 
-                _safe_ui(self.root, ask_on_ui_thread)
+                self._post_ui(ask_on_ui_thread)
                 done.wait()
                 if result["apply_all"]:
                     apply_all_choice = result["update"]
@@ -669,11 +803,11 @@ class MainWindow(
             build_or_update_db_from_pdf(
                 self.state,
                 None,
-                self.status_message,
+                self._push_status,  # coalesced: at most one label update per STATUS_PUMP_MS
                 on_existing_item_decision=on_existing_item_decision,
             )
-            _safe_ui(self.root, self.refresh_items)
-            _safe_ui(self.root, lambda: self._set_status("✅ Cập nhật CSDL từ PDF xong"))
+            self._post_ui(self.refresh_items)
+            self._post_ui(self._set_status, "✅ Cập nhật CSDL từ PDF xong")
 
         self._run_bg("⏳ Đang tạo/cập nhật CSDL từ PDF...", work)
 
@@ -781,19 +915,19 @@ class MainWindow(
                 if settings_src.exists():
                     shutil.copy2(settings_src, settings_dst)
 
-                _safe_ui(
-                    self.root,
+                self._post_ui(
                     lambda: messagebox.showinfo(
                         "Backup xong",
                         f"Đã backup CSDL và assets vào:\n{backup_dir}",
                     ),
                 )
             except Exception as exc:
-                _safe_ui(
-                    self.root,
+                # exc is unbound once the except block ends; format it now
+                err_text = f"Không thể backup: {exc}"
+                self._post_ui(
                     lambda: messagebox.showerror(
                         "Backup lỗi",
-                        f"Không thể backup: {exc}",
+                        err_text,
                     ),
                 )
 
@@ -834,17 +968,6 @@ class MainWindow(
                         continue
                     mapping[key] = (str(v[0]).strip(), str(v[1]).strip())
 
-            # 2) read all DB codes once (exact + normalized index)
-            conn = self.state.db.connect()
-            try:
-                rows = conn.execute("SELECT code FROM items").fetchall()
-                db_codes = [str(r["code"]) for r in rows]
-            finally:
-                conn.close()
-
-            db_code_set = set(db_codes)
-            db_index = _build_db_code_index(db_codes)  # normalized -> original db code (unique only)
-
             # 3) build image map from Excel (embedded images)
             image_map: dict[str, list[str]] = {}
             image_rows_total = 0
@@ -971,43 +1094,40 @@ class MainWindow(
             missing_codes: list[str] = []
             images_updated = 0
             images_missing = 0
-            i = 0
 
-            # 4) update DB (description + images) using one connection
+            # 4) update DB (description + images) using one connection / one transaction
             conn = self.state.db.connect()
             try:
-                for excel_code, desc_pair in mapping.items():
-                    i += 1
-                    excel_code_str = str(excel_code).strip()
-
-                    # exact match first
-                    if excel_code_str in db_code_set:
-                        code_to_update = excel_code_str
-                    else:
-                        # normalized match (only if unique)
-                        code_to_update = db_index.get(_normalize_code_soft(excel_code_str), "")
-
-                    if code_to_update:
-                        desc_vi, desc_en = desc_pair
-                        cur = conn.execute(
-                            "UPDATE items SET description_excel=?, description_vietnames_from_excel=? WHERE code=?",
-                            (str(desc_en).strip(), str(desc_vi).strip(), code_to_update),
-                        )
-                        if cur.rowcount > 0:
-                            updated += 1
-                        else:
-                            missing += 1
-                            if len(missing_codes) < 30:
-                                missing_codes.append(excel_code_str)
-                    else:
+                # matching runs in SQLite against the indexed code / code_norm columns:
+                # exact match first, else normalized match (only if unique).
+                # mapping keys/values were already str()+strip()-ed while reading the sheets.
+                db = self.state.db
+                db.refresh_code_norm(conn)
+                self._push_status(f"⏳ Đang khớp {total} mã Excel với CSDL...")
+                pending: list[tuple[str, str, int]] = []
+                # description and image-only codes resolved together, in batches
+                resolved_by_code = db.resolve_item_codes(
+                    [*mapping, *image_map],
+                    conn,
+                    on_progress=lambda done, n: self._push_status(f"⏳ Đang khớp mã Excel {done}/{n}..."),
+                )
+                for excel_code, (vi, en) in mapping.items():
+                    hit = resolved_by_code[excel_code]
+                    if hit is None:
                         missing += 1
                         if len(missing_codes) < 30:
-                            missing_codes.append(excel_code_str)
-
-                    # progress update (every 25 rows)
-                    if i % 25 == 0:
-                        _safe_ui(self.root, lambda i=i, total=total, updated=updated, missing=missing:
-                                self._set_status(f"⏳ Cập nhật Excel {i}/{total} | đã cập nhật={updated} | thiếu={missing}"))
+                            missing_codes.append(excel_code)
+                        continue
+                    pending.append((en, vi, hit[0]))
+                self._push_status(f"⏳ Cập nhật Excel | khớp={len(pending)} | thiếu={missing}")
+
+                # one cursor for every write in this import
+                cur = conn.cursor()
+                cur.executemany(
+                    "UPDATE items SET description_excel=?, description_vietnames_from_excel=? WHERE id=?",
+                    pending,
+                )
+                updated = max(0, cur.rowcount)
 
                 # images: link excel images into assets + item_asset_links (preferred)
                 excel_asset_pdf_path = f"excel:{xlsx_path}"
@@ -1025,34 +1145,24 @@ class MainWindow(
                             continue
                         seen.add(p)
                         unique_paths.append(p)
-                    excel_code_str = str(excel_code).strip()
-                    if excel_code_str in db_code_set:
-                        code_to_update = excel_code_str
-                    else:
-                        code_to_update = db_index.get(_normalize_code_soft(excel_code_str), "")
-
-                    if not code_to_update:
-                        images_missing += 1
-                        continue
-
-                    row = conn.execute("SELECT id FROM items WHERE code=?", (code_to_update,)).fetchone()
-                    if row is None:
+                    hit = resolved_by_code[excel_code]
+                    if hit is None:
                         images_missing += 1
                         continue
+                    item_id = hit[0]
 
-                    item_id = int(row["id"])
                     # replace existing asset links so Excel images show in UI
-                    conn.execute("DELETE FROM item_asset_links WHERE item_id=?", (item_id,))
+                    cur.execute("DELETE FROM item_asset_links WHERE item_id=?", (item_id,))
                     for idx, p in enumerate(unique_paths):
                         asset_path_db = self.state.db.to_db_path(p) if self.state.db else p
-                        asset_row = conn.execute(
+                        asset_row = cur.execute(
                             "SELECT id FROM assets WHERE pdf_path=? AND page=? AND asset_path=?",
                             (excel_asset_pdf_path_db, 0, asset_path_db),
                         ).fetchone()
                         if asset_row:
                             asset_id = int(asset_row["id"])
                         else:
-                            cur = conn.execute(
+                            cur.execute(
                                 """
                                 INSERT INTO assets(pdf_path, page, asset_path, x0, y0, x1, y1, source, sha256)
                                 VALUES(?,?,?,?,?,?,?,?,?)
@@ -1060,7 +1170,7 @@ class MainWindow(
                                 (excel_asset_pdf_path_db, 0, asset_path_db, None, None, None, None, "excel", ""),
                             )
                             asset_id = int(cur.lastrowid)
-                        conn.execute(
+                        cur.execute(
                             """
                             INSERT OR IGNORE INTO item_asset_links(item_id, asset_id, match_method, score, verified, is_primary)
                             VALUES(?,?,?,?,?,?)
@@ -1074,29 +1184,14 @@ class MainWindow(
                 conn.close()
 
             # 5) refresh UI and show summary
-            _safe_ui(self.root, self.refresh_items)
-            _safe_ui(self.root, lambda: self._set_status(
-                f"✅ Nhập Excel xong | đã cập nhật={updated} | thiếu={missing} | ảnh={images_updated}"
-            ))
-            _safe_ui(
-                self.root,
-                lambda: messagebox.showinfo(
-                    "Nhập Excel xong",
-                    "Số dòng đọc: {total}\nĐã cập nhật: {updated}\nMã thiếu: {missing}\n"
-                    "Ảnh đã gắn: {images_updated}\nẢnh thiếu: {images_missing}\n"
-                    "Ảnh tìm thấy trong file: {image_rows_total}".format(
-                        total=total,
-                        updated=updated,
-                        missing=missing,
-                        images_updated=images_updated,
-                        images_missing=images_missing,
-                        image_rows_total=image_rows_total,
-                    ),
-                ),
+            self._post_ui(self.refresh_items)
+            self._post_ui(
+                self._flash_status,
+                f"✅ Nhập Excel xong | dòng đọc={total} | đã cập nhật={updated} | thiếu={missing} | "
+                f"ảnh đã gắn={images_updated} | ảnh thiếu={images_missing} | ảnh trong file={image_rows_total}",
             )
             if missing_codes:
-                _safe_ui(
-                    self.root,
+                self._post_ui(
                     lambda: messagebox.showwarning(
                         "Mã thiếu (mẫu)",
                         "Một số mã Excel không khớp với CSDL.\n\n"
@@ -1137,19 +1232,11 @@ class MainWindow(
             # 1) detect header + code column using existing heuristics on FIRST sheet (input)
             _df, header_row, code_col = detect_excel_code_column(xlsx_path)
 
-            # 2) build DB code indexes (same logic as on_build_excel_db)
-            conn = self.state.db.connect()
-            try:
-                rows = conn.execute("SELECT code FROM items").fetchall()
-                db_codes = [str(r["code"]) for r in rows]
-            finally:
-                conn.close()
-
-            db_code_set = set(db_codes)
-            db_index = _build_db_code_index(db_codes)  # normalized -> original db code (unique only)
-
+            # 2) build DB code indexes (same logic as on_build_excel_db) from the one item load
             items = self.state.db.list_items()
             code_to_item: dict[str, CatalogItem] = {str(it.code): it for it in items}
+            db_code_set = code_to_item.keys()
+            db_index = _build_db_code_index(db_code_set)  # normalized -> original db code (unique only)
 
             # 3) open workbook and resolve input/output sheets
             wb = load_workbook(xlsx_path)
@@ -1194,6 +1281,16 @@ class MainWindow(
                     qty_val = "" if qty_cell is None else str(qty_cell).strip()
                 input_rows.append((excel_code_str, qty_val))
 
+            # resolve each distinct input code once: exact first, else soft-normalized (unique only)
+            code_to_match_by_input: dict[str, str] = {}
+            for excel_code_str, _qty in input_rows:
+                if excel_code_str not in code_to_match_by_input:
+                    code_to_match_by_input[excel_code_str] = (
+                        excel_code_str
+                        if excel_code_str in db_code_set
+                        else db_index.get(normalize_code_soft(excel_code_str), "")
+                    )
+
             # prepare output sheet: remove merges/images first, then clear rows
             for rng in list(output_ws.merged_cells.ranges):
                 if rng.min_row >= 2:
@@ -1233,10 +1330,7 @@ class MainWindow(
 
             for idx, (excel_code_str, qty_val) in enumerate(input_rows, start=1):
                 total += 1
-                if excel_code_str in db_code_set:
-                    code_to_match = excel_code_str
-                else:
-                    code_to_match = db_index.get(_normalize_code_soft(excel_code_str), "")
+                code_to_match = code_to_match_by_input[excel_code_str]
 
                 it = code_to_item.get(code_to_match) if code_to_match else None
                 if it:
@@ -1375,9 +1469,8 @@ class MainWindow(
             wb.save(xlsx_path)
 
             if matched == 0:
-                sample_db_codes = db_codes[:5]
-                _safe_ui(
-                    self.root,
+                sample_db_codes = list(code_to_item)[:5]
+                self._post_ui(
                     lambda: messagebox.showwarning(
                         "Không có khớp",
                         "Không có mã Excel nào khớp với mã trong CSDL.\n\n"
@@ -1388,17 +1481,13 @@ class MainWindow(
                     ),
                 )
 
-            _safe_ui(self.root, lambda: messagebox.showinfo(
+            self._post_ui(lambda: messagebox.showinfo(
                 "Xuất file xong",
                 f"Mã khớp: {matched}/{total}\nDòng có ảnh: {updated}/{total}\nĐã cập nhật vào sheet 2.",
             ))
-            _safe_ui(
-                self.root,
-                lambda: self._set_status(f"✅ Xuất ảnh ra Excel: khớp {matched}/{total}, ảnh {updated}/{total}")
-            )
+            self._post_ui(self._set_status, f"✅ Xuất ảnh ra Excel: khớp {matched}/{total}, ảnh {updated}/{total}")
             if missing_codes:
-                _safe_ui(
-                    self.root,
+                self._post_ui(
                     lambda: messagebox.showwarning(
                         "Mã thiếu (mẫu)",
                         "Một số mã Excel không khớp với CSDL.\n\n"
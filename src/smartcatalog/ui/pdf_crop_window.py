@@ -1,6 +1,12 @@
 # smartcatalog/ui/pdf_crop_window.py
 from __future__ import annotations
 
+import hashlib
+import io
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Optional
@@ -10,6 +16,8 @@ from PIL import Image, ImageTk
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from smartcatalog.ui.photo import ppm_photo
+
 
 @dataclass
 class PdfCropContext:
@@ -18,6 +26,64 @@ class PdfCropContext:
     pdf_path: Path
 
 
+@dataclass
+class RenderedPage:
+    pil: Image.Image
+    size: tuple[int, int]  # full page size in canvas pixels at this zoom
+    origin: tuple[int, int] = (0, 0)  # where pil sits on the canvas
+    partial: bool = False  # only a viewport slice of the page was rasterized
+    ppm: Optional[bytes] = None  # Tk-ready PPM built by the worker; only kept until shown or superseded
+    photo: Optional[tk.PhotoImage] = None  # uploaded to Tk on first show, reused on revisits
+
+
+def _pixmap_to_pil(pix: fitz.Pixmap) -> Image.Image:
+    """
+    RGB pixmap -> PIL image. Pillow only maps memory for modes like L/RGBA; for RGB
+    frombuffer copies the samples, so the image owns its pixels and pix can be
+    dropped right after. samples_mv avoids pix.samples' extra bytes copy on top.
+    """
+    samples = getattr(pix, "samples_mv", None)
+    if samples is None:
+        samples = pix.samples
+    return Image.frombuffer("RGB", (pix.width, pix.height), samples, "raw", "RGB", pix.stride, 1)
+
+
+def _pixmap_ppm(pix: fitz.Pixmap) -> Optional[bytes]:
+    """
+    PPM bytes straight from the pixmap samples: one allocation, done on the render
+    worker so the Tk thread only uploads. None if rows are padded (use ppm_photo).
+
+    Memory per page pixel: the worker peaks at pixmap 3 B + PIL copy 4 B + PPM 3 B;
+    the pixmap is gone when the job returns, the PPM once the page is shown (or
+    superseded), leaving the PIL image as the only Python-side buffer in the LRU.
+    Building the PPM from the PIL image on the Tk thread instead would cost two
+    3 B/px copies (tobytes + header concat) there on every first show.
+    """
+    if pix.n != 3 or pix.stride != pix.width * 3:
+        return None
+    samples = getattr(pix, "samples_mv", None)
+    if samples is None:
+        samples = pix.samples
+    return b"".join((b"P6\n%d %d\n255\n" % (pix.width, pix.height), samples))
+
+
+def _clamp_bbox(
+    x0: int, y0: int, x1: int, y1: int, w: int, h: int, min_side: int = 10
+) -> Optional[tuple[int, int, int, int]]:
+    """Normalize a drag rectangle, clamp it to a w x h page; None if smaller than min_side."""
+    if x1 < x0:
+        x0, x1 = x1, x0
+    if y1 < y0:
+        y0, y1 = y1, y0
+    x0 = max(0, min(w - 1, x0))
+    x1 = max(0, min(w, x1))
+    y0 = max(0, min(h - 1, y0))
+    y1 = max(0, min(h, y1))
+    if (x1 - x0) < min_side or (y1 - y0) < min_side:
+        return None
+    return x0, y0, x1, y1
+
+
 class PdfCropWindow(tk.Toplevel):
     """
     Popup window for viewing a PDF page and cropping an area to create an asset + link to item.
@@ -26,8 +92,35 @@ class PdfCropWindow(tk.Toplevel):
       - Drag to select
       - Enter = Save crop
       - Esc = Clear selection
+
+    Pages are rendered on a single worker thread (fitz documents must not be used
+    concurrently; the Tk thread only reads values cached when the document opened)
+    and kept in a small LRU keyed by (page_index, zoom), so flipping back to a page
+    or toggling zoom doesn't re-render or re-upload the Tk image.
+    Zooming out of a page that is cached at a higher zoom resamples that render with
+    PIL instead of re-rasterizing through MuPDF.
+    Pages larger than VIEWPORT_RENDER_MIN_PX at the current zoom are rendered only
+    around the visible area and re-rendered (debounced) when scrolled out of it;
+    those slices are not cached.
+    Hovering Prev/Next previews the neighbouring page from a small JPEG thumbnail
+    (MuPDF-encoded on the worker, kept per page for the window's lifetime).
     """
 
+    PAGE_CACHE_MAX = 8
+    RENDER_POLL_MS = 15
+    MAX_VIEW_ZOOM = 2.0  # the old fixed zoom; fit-to-width never renders larger than this
+    CROP_ZOOM = 2.0      # saved crops are re-rasterized at this scale, independent of the view
+    VIEWPORT_RENDER_MIN_PX = 4_000_000  # full pages above this many pixels render as viewport slices
+    VIEWPORT_MARGIN = 256
+    VIEWPORT_DEBOUNCE_MS = 80
+    CROP_PNG_COMPRESS_LEVEL = 1
+    PREVIEW_ZOOM = 0.25
+    PREVIEW_JPEG_QUALITY = 50
+    PREVIEW_HOVER_MS = 250
+
+    # (crop dir, base name) -> last crop index handed out (shared by all crop windows)
+    _next_crop_idx: dict[tuple[Path, str], int] = {}
+
     def __init__(
         self,
         parent: tk.Misc,
@@ -55,25 +148,51 @@ class PdfCropWindow(tk.Toplevel):
 
         # PDF state
         self._doc: Optional[fitz.Document] = None
+        self._page_count: int = 0  # read on the worker at open; 0 until the document is open
         self._page_index: int = max(0, self.ctx.page_1based - 1)
-        self._zoom: float = 2.0
-        self._page_pil: Optional[Image.Image] = None
-        self._page_tk: Optional[ImageTk.PhotoImage] = None
+        self._zoom: float = self.MAX_VIEW_ZOOM  # replaced by _fit_width_zoom() once the doc is open
+        # full page size (canvas px) of what is shown; None while the page/zoom is rendering
+        self._page_size: Optional[tuple[int, int]] = None
+        self._page_tk: Optional[tk.PhotoImage] = None
+        self._page_img_id: Optional[int] = None
+        self._shown: Optional[RenderedPage] = None
+        self._shown_key: Optional[tuple[int, float]] = None
+        self._viewport_job: Optional[str] = None
+        self._page_cache: "OrderedDict[tuple[int, float], RenderedPage]" = OrderedDict()
+        self._render_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-render")
+        self._render_token: int = 0
+        # queued/running worker jobs destroy() may cancel (crop saves are never cancelled)
+        self._render_jobs: set[Future] = set()
 
         # selection state (canvas coords)
         self._sel_start: Optional[tuple[int, int]] = None
         self._sel_rect_id: Optional[int] = None
         self._sel_rect_canvas: Optional[tuple[int, int, int, int]] = None
+        self._drag_xy: Optional[tuple[int, int]] = None
+        self._drag_job: Optional[str] = None
+        self._saving: bool = False
+
+        # Prev/Next hover previews: page index -> JPEG bytes
+        self._preview_jpeg: dict[int, bytes] = {}
+        self._preview_tip: Optional[tk.Toplevel] = None
+        self._preview_photo: Optional[ImageTk.PhotoImage] = None
+        self._preview_job: Optional[str] = None
+        self._preview_token: int = 0
+        self._doc_open_future: Optional[Future] = None
 
         self._build_ui()
         self._bind_shortcuts()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
-        if not self._ensure_doc_open():
-            messagebox.showerror("Thiếu PDF", "Chưa chọn PDF hoặc không thể mở PDF.")
-            self.destroy()
+        if not self.ctx.pdf_path or not self.ctx.pdf_path.exists():
+            self._on_doc_open_failed()
             return
 
-        self._render_page()
+        # fitz.open parses the xref up front; do it on the render worker (which owns
+        # the document anyway) so the window shows immediately
+        self.lbl_info.configure(text=f"Đang mở PDF: {self.ctx.pdf_path.name}...")
+        self._doc_open_future = self._submit_job(self._open_doc, str(self.ctx.pdf_path), self._page_index)
+        self.after(self.RENDER_POLL_MS, self._poll_doc_open)
 
     # -------------------------
     # UI
@@ -92,8 +211,14 @@ class PdfCropWindow(tk.Toplevel):
 
         ttk.Separator(top, orient="vertical").pack(side="left", fill="y", padx=10)
 
-        ttk.Button(top, text="◀ Trang trước", command=self._prev_page).pack(side="left")
-        ttk.Button(top, text="Trang sau ▶", command=self._next_page).pack(side="left", padx=(6, 0))
+        btn_prev = ttk.Button(top, text="◀ Trang trước", command=self._prev_page)
+        btn_prev.pack(side="left")
+        btn_next = ttk.Button(top, text="Trang sau ▶", command=self._next_page)
+        btn_next.pack(side="left", padx=(6, 0))
+        for btn, step in ((btn_prev, -1), (btn_next, 1)):
+            btn.bind("<Enter>", lambda _e, b=btn, d=step: self._schedule_preview(b, d), add="+")
+            btn.bind("<Leave>", lambda _e: self._hide_preview(), add="+")
+            btn.bind("<ButtonPress-1>", lambda _e: self._hide_preview(), add="+")
 
         ttk.Separator(top, orient="vertical").pack(side="left", fill="y", padx=10)
 
@@ -112,13 +237,14 @@ class PdfCropWindow(tk.Toplevel):
         self.canvas = tk.Canvas(mid, highlightthickness=1)
         self.canvas.pack(side="left", fill="both", expand=True)
 
-        vscroll = ttk.Scrollbar(mid, orient="vertical", command=self.canvas.yview)
-        vscroll.pack(side="right", fill="y")
+        self._vscroll = ttk.Scrollbar(mid, orient="vertical", command=self.canvas.yview)
+        self._vscroll.pack(side="right", fill="y")
 
-        hscroll = ttk.Scrollbar(root, orient="horizontal", command=self.canvas.xview)
-        hscroll.pack(fill="x")
+        self._hscroll = ttk.Scrollbar(root, orient="horizontal", command=self.canvas.xview)
+        self._hscroll.pack(fill="x")
 
-        self.canvas.configure(yscrollcommand=vscroll.set, xscrollcommand=hscroll.set)
+        self.canvas.configure(yscrollcommand=self._on_yscroll, xscrollcommand=self._on_xscroll)
+        self.canvas.bind("<Configure>", self._schedule_viewport_render, add="+")
 
         self.canvas.bind("<Button-1>", self._on_mouse_down)
         self.canvas.bind("<B1-Motion>", self._on_mouse_drag)
@@ -141,69 +267,382 @@ class PdfCropWindow(tk.Toplevel):
     # PDF lifecycle / rendering
     # -------------------------
 
-    def _ensure_doc_open(self) -> bool:
-        if self._doc is not None:
-            return True
-
-        if not self.ctx.pdf_path or not self.ctx.pdf_path.exists():
-            return False
-
+    def _submit_job(self, fn: Callable, *args) -> Future:
+        fut = self._render_pool.submit(fn, *args)
+        self._render_jobs.add(fut)
+        fut.add_done_callback(self._render_jobs.discard)
+        return fut
+
+    @staticmethod
+    def _open_doc(path: str, page_index: int) -> tuple[fitz.Document, int, float]:
+        """
+        Worker thread: open the PDF. The page count and the width (points) of the first
+        page to show are returned for the Tk thread, which never reads the document.
+        """
+        doc = fitz.open(path)
+        count = doc.page_count
+        page_w = float(doc[page_index].rect.width) if 0 <= page_index < count else 0.0
+        return doc, count, page_w
+
+    def _poll_doc_open(self) -> None:
+        if not self.winfo_exists():
+            return
+        fut = self._doc_open_future
+        if fut is None:
+            return
+        if not fut.done():
+            self.after(self.RENDER_POLL_MS, self._poll_doc_open)
+            return
+        self._doc_open_future = None
         try:
-            self._doc = fitz.open(str(self.ctx.pdf_path))
-            return True
+            self._doc, self._page_count, page_w = fut.result()
         except Exception:
-            self._doc = None
-            return False
+            self._on_doc_open_failed()
+            return
+
+        self._zoom = self._fit_width_zoom(page_w)
+        self._render_page()
+
+    def _on_doc_open_failed(self) -> None:
+        messagebox.showerror("Thiếu PDF", "Chưa chọn PDF hoặc không thể mở PDF.")
+        self.destroy()
+
+    def _on_close(self) -> None:
+        # a crop being written must still be registered in the DB, or the PNG is orphaned
+        if self._saving:
+            self.bell()
+            self.lbl_info.configure(text="Đang lưu ảnh cắt... vui lòng đợi")
+            return
+        self.destroy()
 
     def destroy(self) -> None:
+        self._render_token += 1
+        self._hide_preview()
+        for job in (self._viewport_job, self._drag_job):
+            if job is not None:
+                self.after_cancel(job)
+        self._viewport_job = self._drag_job = None
+        # Don't block the Tk thread on an in-flight open/render: drop what is still
+        # queued and let the worker close the document as its last job, after
+        # whatever it is running (and any crop save) has finished.
+        for fut in list(self._render_jobs):
+            fut.cancel()
         try:
-            if self._doc is not None:
-                self._doc.close()
-        except Exception:
-            pass
+            self._render_pool.submit(self._close_doc, self._doc, self._doc_open_future)
+        except RuntimeError:
+            pass  # destroy() already ran
+        self._render_pool.shutdown(wait=False)
+        self._doc_open_future = None
         self._doc = None
+        self._page_count = 0
         super().destroy()
 
+    @staticmethod
+    def _close_doc(doc: Optional[fitz.Document], open_future: Optional[Future]) -> None:
+        """Worker thread: final job; also closes a document that finished opening late."""
+        if doc is None and open_future is not None and open_future.done():
+            if not open_future.cancelled() and open_future.exception() is None:
+                doc = open_future.result()[0]
+        try:
+            if doc is not None:
+                doc.close()
+        except Exception:
+            pass
+
+    def _fit_width_zoom(self, page_w: float) -> float:
+        """
+        Zoom that fits a page of width page_w (PDF points) to the canvas width (capped
+        at MAX_VIEW_ZOOM), so the first render is at screen resolution instead of a fixed 2x.
+        """
+        try:
+            self.canvas.update_idletasks()
+            canvas_w = int(self.canvas.winfo_width())
+        except Exception:
+            return self.MAX_VIEW_ZOOM
+        if canvas_w <= 1 or page_w <= 0:
+            return self.MAX_VIEW_ZOOM
+        return max(0.6, min(self.MAX_VIEW_ZOOM, (canvas_w - 4) / page_w))
+
     def _set_zoom(self, z: float) -> None:
         self._zoom = float(z)
         self._render_page()
 
     def _prev_page(self) -> None:
-        if not self._doc:
+        if not self._page_count:
             return
         self._page_index = max(0, self._page_index - 1)
         self._render_page()
 
     def _next_page(self) -> None:
-        if not self._doc:
+        if not self._page_count:
             return
-        self._page_index = min(len(self._doc) - 1, self._page_index + 1)
+        self._page_index = min(self._page_count - 1, self._page_index + 1)
         self._render_page()
 
     def _render_page(self) -> None:
-        if not self._doc:
+        if not self._page_count:
             return
-        if self._page_index < 0 or self._page_index >= len(self._doc):
+        if self._page_index < 0 or self._page_index >= self._page_count:
             return
 
-        page = self._doc[self._page_index]
-        mat = fitz.Matrix(self._zoom, self._zoom)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
+        key = (self._page_index, self._zoom)
+        self._render_token += 1
+        page = self._page_cache.get(key)
+        if page is not None:
+            self._page_cache.move_to_end(key)
+            self._show_page(page)
+            return
 
-        pil = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-        self._page_pil = pil
-        self._page_tk = ImageTk.PhotoImage(pil)
+        # the shown image no longer matches _page_index/_zoom: block crops until it does
+        self._page_size = None
+        self._shown_key = None
+        self._clear_selection()
+        self.lbl_info.configure(text=f"Đang hiển thị trang {self._page_index + 1}...")
+        base = self._cached_base_for(*key)
+        if base is not None:
+            fut = self._submit_job(self._downscale, base, key[1])
+            self.after(self.RENDER_POLL_MS, self._poll_render, fut, self._render_token, key)
+            return
+        self._submit_render(key)
+
+    def _cached_base_for(self, page_index: int, zoom: float) -> Optional[tuple[RenderedPage, float]]:
+        """Smallest cached full render of page_index above zoom, if resampling it stays a full page."""
+        best: Optional[tuple[RenderedPage, float]] = None
+        for (idx, z), page in self._page_cache.items():
+            if idx != page_index or z <= zoom or page.partial:
+                continue
+            if best is None or z < best[1]:
+                best = (page, z)
+        if best is None:
+            return None
+        w, h = best[0].size
+        scale = zoom / best[1]
+        if (w * scale) * (h * scale) > self.VIEWPORT_RENDER_MIN_PX:
+            return None
+        return best
+
+    def _downscale(self, base: tuple[RenderedPage, float], zoom: float) -> RenderedPage:
+        """Worker thread: derive a lower-zoom view from a cached render (C resample, no MuPDF)."""
+        page, base_zoom = base
+        scale = zoom / base_zoom
+        size = (max(1, round(page.size[0] * scale)), max(1, round(page.size[1] * scale)))
+        pil = page.pil.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+        ppm = b"P6\n%d %d\n255\n" % size + pil.tobytes()
+        return RenderedPage(pil=pil, size=size, ppm=ppm)
+
+    def _submit_render(self, key: tuple[int, float]) -> None:
+        fut = self._submit_job(self._rasterize, *key, self._visible_rect(self.VIEWPORT_MARGIN))
+        self.after(self.RENDER_POLL_MS, self._poll_render, fut, self._render_token, key)
+
+    def _visible_rect(self, margin: int = 0) -> tuple[int, int, int, int]:
+        """Visible canvas area (canvas px), grown by margin on every side."""
+        x0 = int(self.canvas.canvasx(0))
+        y0 = int(self.canvas.canvasy(0))
+        x1 = x0 + int(self.canvas.winfo_width())
+        y1 = y0 + int(self.canvas.winfo_height())
+        return x0 - margin, y0 - margin, x1 + margin, y1 + margin
+
+    def _rasterize(
+        self, page_index: int, zoom: float, viewport: tuple[int, int, int, int]
+    ) -> RenderedPage:
+        """
+        Worker thread: fitz page -> PIL RGB (no Tk calls here). Big pages only get the
+        viewport (canvas px) rasterized, via a clip in PDF points.
+        """
+        page = self._doc[page_index]
+        mat = fitz.Matrix(zoom, zoom)
+        full = (page.rect * mat).irect
+        size = (full.width, full.height)
+        if size[0] * size[1] <= self.VIEWPORT_RENDER_MIN_PX:
+            pix = page.get_pixmap(matrix=mat, alpha=False)
+            return RenderedPage(pil=_pixmap_to_pil(pix), size=size, ppm=_pixmap_ppm(pix))
+
+        vx0, vy0, vx1, vy1 = viewport
+        vx0, vy0 = max(0, vx0), max(0, vy0)
+        vx1, vy1 = min(size[0], vx1), min(size[1], vy1)
+        if vx1 <= vx0 or vy1 <= vy0:
+            vx0, vy0, vx1, vy1 = 0, 0, min(size[0], 1), min(size[1], 1)
+        clip = fitz.Rect(vx0 / zoom, vy0 / zoom, vx1 / zoom, vy1 / zoom)
+        pix = page.get_pixmap(matrix=mat, clip=clip, alpha=False)
+        return RenderedPage(
+            pil=_pixmap_to_pil(pix), size=size, origin=(pix.x, pix.y), partial=True,
+            ppm=_pixmap_ppm(pix),
+        )
+
+    def _on_xscroll(self, first: str, last: str) -> None:
+        self._hscroll.set(first, last)
+        self._schedule_viewport_render()
 
-        self.canvas.delete("all")
-        self.canvas.create_image(0, 0, image=self._page_tk, anchor="nw")
-        self.canvas.configure(scrollregion=(0, 0, pil.width, pil.height))
+    def _on_yscroll(self, first: str, last: str) -> None:
+        self._vscroll.set(first, last)
+        self._schedule_viewport_render()
 
+    def _schedule_viewport_render(self, _e=None) -> None:
+        # only slices need it; scrollbar drags are collapsed into one render
+        if self._shown is None or not self._shown.partial:
+            return
+        if self._viewport_job is not None:
+            self.after_cancel(self._viewport_job)
+        self._viewport_job = self.after(self.VIEWPORT_DEBOUNCE_MS, self._render_viewport)
+
+    def _render_viewport(self) -> None:
+        self._viewport_job = None
+        shown = self._shown
+        if shown is None or not shown.partial or self._page_size is None:
+            return
+        ox, oy = shown.origin
+        sw, sh = shown.pil.size
+        x0, y0, x1, y1 = self._visible_rect()
+        x1, y1 = min(x1, shown.size[0]), min(y1, shown.size[1])
+        if ox <= max(0, x0) and oy <= max(0, y0) and x1 <= ox + sw and y1 <= oy + sh:
+            return  # still covered by the current slice
+        self._render_token += 1
+        self._submit_render(self._shown_key)
+
+    def _rasterize_clip(self, page_index: int, bbox_pdf: tuple[float, float, float, float]) -> RenderedPage:
+        """Worker thread: render only bbox_pdf (PDF points) of a page at CROP_ZOOM."""
+        page = self._doc[page_index]
+        z = self.CROP_ZOOM
+        pix = page.get_pixmap(matrix=fitz.Matrix(z, z), clip=fitz.Rect(*bbox_pdf), alpha=False)
+        pil = _pixmap_to_pil(pix)
+        del pix  # pil holds its own copy; don't keep both until the PNG is written
+        return RenderedPage(pil=pil, size=pil.size)
+
+    def _poll_render(self, fut: Future, token: int, key: tuple[int, float]) -> None:
+        # polled from the Tk thread so results never touch Tk from the worker
+        if not self.winfo_exists():
+            return
+        if not fut.done():
+            self.after(self.RENDER_POLL_MS, self._poll_render, fut, token, key)
+            return
+        try:
+            page = fut.result()
+        except Exception as exc:
+            if token == self._render_token:
+                self.lbl_info.configure(text=f"Không thể hiển thị trang: {exc}")
+            return
+
+        # a newer page/zoom was requested meanwhile: keep the render cached only, without
+        # its PPM copy (the PIL image already holds the pixels; a revisit rebuilds the photo)
+        superseded = token != self._render_token
+        if superseded:
+            page.ppm = None
+
+        if not page.partial:
+            self._page_cache[key] = page
+            self._page_cache.move_to_end(key)
+            while len(self._page_cache) > self.PAGE_CACHE_MAX:
+                self._page_cache.popitem(last=False)
+
+        if not superseded:
+            self._show_page(page)
+
+    def _show_page(self, page: RenderedPage) -> None:
+        if page.photo is None:
+            if page.ppm is not None:
+                page.photo = tk.PhotoImage(data=page.ppm, format="PPM")
+                page.ppm = None
+            else:
+                page.photo = ppm_photo(page.pil)
+        previous = self._shown
+        self._page_tk = page.photo
+        self._shown = page
+        self._page_size = page.size
+
+        # one persistent "page_img" item below the "sel" layer; only what changed is
+        # touched, so re-showing a cached page never re-sends its bitmap to the display
+        if self._page_img_id is None:
+            self._page_img_id = self.canvas.create_image(
+                *page.origin, image=self._page_tk, anchor="nw", tags="page_img"
+            )
+            self.canvas.tag_lower("page_img")
+        elif page is not previous:
+            if previous is None or previous.photo is not page.photo:
+                self.canvas.itemconfigure(self._page_img_id, image=self._page_tk)
+            if previous is None or previous.origin != page.origin:
+                self.canvas.coords(self._page_img_id, *page.origin)
+
+        key = (self._page_index, self._zoom)
+        if key == self._shown_key:
+            return  # a new viewport slice of the page already shown: keep the selection
+        self._shown_key = key
+
+        self.canvas.configure(scrollregion=(0, 0, page.size[0], page.size[1]))
         self._clear_selection()
 
         self.lbl_info.configure(
-            text=f"PDF: {self.ctx.pdf_path.name} | Trang {self._page_index + 1}/{len(self._doc)} | Phóng to {self._zoom:.2f} | Sản phẩm {self.ctx.item_id}"
+            text=f"PDF: {self.ctx.pdf_path.name} | Trang {self._page_index + 1}/{self._page_count} | Phóng to {self._zoom:.2f} | Sản phẩm {self.ctx.item_id}"
         )
 
+    # -------------------------
+    # Prev/Next page preview
+    # -------------------------
+
+    def _thumb_for(self, page_index: int) -> bytes:
+        """Worker thread: low-zoom render JPEG-encoded by MuPDF (no PIL pixel copy)."""
+        z = self.PREVIEW_ZOOM
+        pix = self._doc[page_index].get_pixmap(matrix=fitz.Matrix(z, z), alpha=False)
+        return pix.tobytes("jpeg", jpg_quality=self.PREVIEW_JPEG_QUALITY)
+
+    def _schedule_preview(self, btn: ttk.Button, step: int) -> None:
+        self._hide_preview()
+        self._preview_job = self.after(self.PREVIEW_HOVER_MS, self._request_preview, btn, step)
+
+    def _request_preview(self, btn: ttk.Button, step: int) -> None:
+        self._preview_job = None
+        if not self._page_count:
+            return
+        idx = self._page_index + step
+        if idx < 0 or idx >= self._page_count:
+            return
+        token = self._preview_token
+        data = self._preview_jpeg.get(idx)
+        if data is not None:
+            self._show_preview(btn, idx, data)
+            return
+        fut = self._submit_job(self._thumb_for, idx)
+        self.after(self.RENDER_POLL_MS, self._poll_preview, fut, token, btn, idx)
+
+    def _poll_preview(self, fut: Future, token: int, btn: ttk.Button, idx: int) -> None:
+        if not self.winfo_exists():
+            return
+        if not fut.done():
+            self.after(self.RENDER_POLL_MS, self._poll_preview, fut, token, btn, idx)
+            return
+        try:
+            data = fut.result()
+        except Exception:
+            return
+        self._preview_jpeg[idx] = data
+        # the pointer left the button (or moved on) while it was rendering
+        if token == self._preview_token:
+            self._show_preview(btn, idx, data)
+
+    def _show_preview(self, btn: ttk.Button, idx: int, data: bytes) -> None:
+        try:
+            self._preview_photo = ImageTk.PhotoImage(Image.open(io.BytesIO(data)))
+        except Exception:
+            return
+        tip = tk.Toplevel(self)
+        tip.overrideredirect(True)
+        tip.attributes("-topmost", True)
+        ttk.Label(tip, image=self._preview_photo, text=f"Trang {idx + 1}", compound="top").pack()
+        tip.geometry(f"+{btn.winfo_rootx()}+{btn.winfo_rooty() + btn.winfo_height() + 4}")
+        self._preview_tip = tip
+
+    def _hide_preview(self) -> None:
+        self._preview_token += 1
+        if self._preview_job is not None:
+            self.after_cancel(self._preview_job)
+            self._preview_job = None
+        if self._preview_tip is not None:
+            try:
+                self._preview_tip.destroy()
+            except Exception:
+                pass
+            self._preview_tip = None
+        self._preview_photo = None
+
     # -------------------------
     # Selection rectangle
     # -------------------------
@@ -222,42 +661,47 @@ class PdfCropWindow(tk.Toplevel):
         self._sel_rect_id = None
 
     def _on_mouse_down(self, e) -> None:
-        if self._page_pil is None:
+        if self._page_size is None:
             return
         self._clear_selection()
 
         x, y = self._canvas_to_image_xy(e.x, e.y)
         self._sel_start = (x, y)
-        self._sel_rect_id = self.canvas.create_rectangle(x, y, x, y, outline="red", width=2)
+        self._sel_rect_id = self.canvas.create_rectangle(x, y, x, y, outline="red", width=2, tags="sel")
 
     def _on_mouse_drag(self, e) -> None:
-        if self._page_pil is None or not self._sel_start or self._sel_rect_id is None:
+        if self._page_size is None or not self._sel_start or self._sel_rect_id is None:
+            return
+        # motion events can outpace redraws: keep the latest position, update once per idle
+        self._drag_xy = (e.x, e.y)
+        if self._drag_job is None:
+            self._drag_job = self.after_idle(self._apply_drag)
+
+    def _apply_drag(self) -> None:
+        self._drag_job = None
+        if not self._sel_start or self._sel_rect_id is None or self._drag_xy is None:
             return
         x0, y0 = self._sel_start
-        x1, y1 = self._canvas_to_image_xy(e.x, e.y)
+        x1, y1 = self._canvas_to_image_xy(*self._drag_xy)
         self.canvas.coords(self._sel_rect_id, x0, y0, x1, y1)
 
     def _on_mouse_up(self, e) -> None:
-        if self._page_pil is None or not self._sel_start or self._sel_rect_id is None:
+        if self._drag_job is not None:
+            self.after_cancel(self._drag_job)
+            self._drag_job = None
+        if self._page_size is None or not self._sel_start or self._sel_rect_id is None:
             return
 
         x0, y0 = self._sel_start
         x1, y1 = self._canvas_to_image_xy(e.x, e.y)
+        self.canvas.coords(self._sel_rect_id, x0, y0, x1, y1)
 
-        x0, x1 = sorted([int(x0), int(x1)])
-        y0, y1 = sorted([int(y0), int(y1)])
-
-        w, h = self._page_pil.size
-        x0 = max(0, min(w - 1, x0))
-        x1 = max(0, min(w, x1))
-        y0 = max(0, min(h - 1, y0))
-        y1 = max(0, min(h, y1))
-
-        if (x1 - x0) < 10 or (y1 - y0) < 10:
+        bbox = _clamp_bbox(x0, y0, x1, y1, *self._page_size)
+        if bbox is None:
             self._clear_selection()
             return
 
-        self._sel_rect_canvas = (x0, y0, x1, y1)
+        self._sel_rect_canvas = bbox
         self._sel_start = None
 
     # -------------------------
@@ -266,18 +710,32 @@ class PdfCropWindow(tk.Toplevel):
 
     def _next_crop_filename(self, out_dir: Path, base: str) -> Path:
         out_dir.mkdir(parents=True, exist_ok=True)
-        # item12_p0012_crop001.png
-        for i in range(1, 10000):
-            p = out_dir / f"{base}_crop{i:03d}.png"
-            if not p.exists():
-                return p
-        return out_dir / f"{base}_crop9999.png"
+        # item12_p0012_crop001.png: the first crop of a (dir, base) in this session takes
+        # the highest existing index from one directory listing; later ones continue
+        # from the cache (one stat, in case another process saved in between)
+        key = (out_dir, base)
+        last = PdfCropWindow._next_crop_idx.get(key)
+        if last is None:
+            pat = re.compile(rf"{re.escape(base)}_crop(\d+)\.png$")
+            last = 0
+            with os.scandir(out_dir) as it:
+                for entry in it:
+                    m = pat.match(entry.name)
+                    if m:
+                        last = max(last, int(m.group(1)))
+        i = last + 1
+        while (out_dir / f"{base}_crop{i:03d}.png").exists():
+            i += 1
+        PdfCropWindow._next_crop_idx[key] = i
+        return out_dir / f"{base}_crop{i:03d}.png"
 
     def _save_crop(self) -> None:
+        if self._saving:
+            return
         if not self.state.db:
             messagebox.showwarning("Thiếu CSDL", "CSDL chưa được tải.")
             return
-        if self._page_pil is None or not self._sel_rect_canvas:
+        if self._page_size is None or not self._sel_rect_canvas:
             messagebox.showwarning("Chưa chọn vùng", "Vui lòng kéo trên PDF để chọn vùng cắt trước.")
             return
 
@@ -288,28 +746,69 @@ class PdfCropWindow(tk.Toplevel):
             return
 
         x0, y0, x1, y1 = self._sel_rect_canvas
-        crop = self._page_pil.crop((x0, y0, x1, y1))
-
-        # Save into: config/database/assets/manual_crop/pXXXX/
-        out_dir = self.state.assets_dir / "pdf_import" / "manual_crop" / f"p{(self._page_index + 1):04d}"
-        base = f"item{self.ctx.item_id}_p{(self._page_index + 1):04d}"
-        out_path = self._next_crop_filename(out_dir, base)
-        crop.save(out_path, format="PNG")
 
         # bbox in PDF points (pixels / zoom)
         z = float(self._zoom)
         bbox_pdf = (x0 / z, y0 / z, x1 / z, y1 / z)
 
-        asset_id = upsert_asset(
+        # Save into: config/database/assets/manual_crop/pXXXX/
+        page_index = self._page_index
+        out_dir = self.state.assets_dir / "pdf_import" / "manual_crop" / f"p{(page_index + 1):04d}"
+        base = f"item{self.ctx.item_id}_p{(page_index + 1):04d}"
+        out_path = self._next_crop_filename(out_dir, base)
+
+        # Rasterize + PNG-encode on the render worker (the document is never used from
+        # two threads at once); the window stays responsive and DB work follows once
+        # the file is on disk.
+        self._saving = True
+        self.lbl_info.configure(text="Đang lưu ảnh cắt...")
+        fut = self._render_pool.submit(self._write_crop, page_index, bbox_pdf, out_path)
+        self.after(self.RENDER_POLL_MS, self._poll_save, fut, page_index, bbox_pdf, out_path)
+
+    def _write_crop(self, page_index: int, bbox_pdf: tuple[float, float, float, float], out_path: Path) -> str:
+        """
+        Worker thread. The view is only rendered at screen resolution; rasterize just
+        the selected clip at CROP_ZOOM so saved crops keep their quality.
+        Returns the sha256 of the PNG as written.
+        """
+        # One pixel copy remains (RGB pixmap -> PIL, see _pixmap_to_pil). It is only the
+        # selected clip, not the page, and the pixmap is freed before encoding. A
+        # mappable RGBA render would avoid it but gives a transparent background.
+        crop = self._rasterize_clip(page_index, bbox_pdf)
+        buf = io.BytesIO()
+        # low zlib level: a fraction of the encode time for slightly larger files
+        crop.pil.save(buf, format="PNG", compress_level=self.CROP_PNG_COMPRESS_LEVEL)
+        # hash the encoded bytes in memory, then one write: the file is never re-read
+        digest = hashlib.sha256(buf.getbuffer()).hexdigest()
+        out_path.write_bytes(buf.getbuffer())
+        return digest
+
+    def _poll_save(
+        self, fut: Future, page_index: int, bbox_pdf: tuple[float, float, float, float], out_path: Path
+    ) -> None:
+        if not self.winfo_exists():
+            return
+        if not fut.done():
+            self.after(self.RENDER_POLL_MS, self._poll_save, fut, page_index, bbox_pdf, out_path)
+            return
+        self._saving = False
+        try:
+            sha256 = fut.result()
+        except Exception as exc:
+            self.lbl_info.configure(text="—")
+            messagebox.showerror("Lỗi", f"Không thể lưu ảnh cắt: {exc}")
+            return
+
+        asset_id = self.state.db.upsert_asset(
             pdf_path=str(self.ctx.pdf_path),
-            page=int(self._page_index + 1),
+            page=int(page_index + 1),
             asset_path=str(out_path),
             bbox=bbox_pdf,
             source="manual_crop",
-            sha256="",
+            sha256=sha256,
         )
 
-        link_asset(
+        self.state.db.link_asset_to_item(
             item_id=int(self.ctx.item_id),
             asset_id=int(asset_id),
             match_method="manual_crop",
@@ -0,0 +1,28 @@
+# smartcatalog/ui/photo.py
+from __future__ import annotations
+
+import tkinter as tk
+
+from PIL import Image
+
+
+def flatten_rgb(pil: Image.Image) -> Image.Image:
+    """Return an RGB image; transparent areas are flattened onto white."""
+    if pil.mode not in ("RGB", "RGBA"):
+        pil = pil.convert("RGBA")
+    if pil.mode == "RGBA":
+        bg = Image.new("RGB", pil.size, (255, 255, 255))
+        bg.paste(pil, mask=pil.getchannel("A"))
+        pil = bg
+    return pil
+
+
+def ppm_photo(pil: Image.Image) -> tk.PhotoImage:
+    """
+    Build a Tk photo directly from raw RGB bytes (hand-written PPM header).
+    Skips ImageTk's own encode path, which adds up for thumbnails and full PDF pages.
+    Must be called on the Tk thread.
+    """
+    pil = flatten_rgb(pil)
+    w, h = pil.size
+    return tk.PhotoImage(data=b"P6\n%d %d\n255\n" % (w, h) + pil.tobytes(), format="PPM")
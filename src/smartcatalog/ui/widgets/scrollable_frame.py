@@ -4,6 +4,58 @@ import tkinter as tk
 from tkinter import ttk
 
 
+class WheelScroller:
+    """
+    Mouse-wheel scrolling for a canvas, active only while the pointer is over area
+    (or one of its descendants): the app-wide wheel bindings are installed on <Enter>
+    and removed on <Leave>, so wheel events elsewhere aren't hijacked.
+    """
+
+    def __init__(self, area: tk.Misc, canvas: tk.Canvas):
+        self.area = area
+        self.canvas = canvas
+        self._bound = False
+        area.bind("<Enter>", self._bind_wheel, add="+")
+        area.bind("<Leave>", self._unbind_wheel, add="+")
+
+    def _bind_wheel(self, _e=None):
+        if self._bound:
+            return
+        self._bound = True
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)      # Windows
+        self.canvas.bind_all("<Button-4>", self._on_mousewheel_linux)  # Linux up
+        self.canvas.bind_all("<Button-5>", self._on_mousewheel_linux)  # Linux down
+
+    def _unbind_wheel(self, e=None):
+        # <Leave> also fires when the pointer moves onto a child widget; ignore that
+        if e is not None and self._contains_pointer(e.x_root, e.y_root):
+            return
+        if not self._bound:
+            return
+        self._bound = False
+        self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.unbind_all("<Button-4>")
+        self.canvas.unbind_all("<Button-5>")
+
+    def _contains_pointer(self, x_root: int, y_root: int) -> bool:
+        try:
+            w = self.area.winfo_containing(x_root, y_root)
+        except (KeyError, tk.TclError):
+            # pointer over a Tk-internal window (e.g. a combobox popdown)
+            return False
+        while w is not None:
+            if w is self.area:
+                return True
+            w = w.master
+        return False
+
+    def _on_mousewheel(self, e):
+        self.canvas.yview_scroll(int(-1 * (e.delta / 120)), "units")
+
+    def _on_mousewheel_linux(self, e):
+        self.canvas.yview_scroll(-1 if e.num == 4 else 1, "units")
+
+
 class ScrollableFrame(ttk.Frame):
     def __init__(self, parent, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
@@ -15,6 +67,7 @@ class ScrollableFrame(ttk.Frame):
         self.inner = ttk.Frame(self.canvas)
 
         self._win = self.canvas.create_window((0, 0), window=self.inner, anchor="nw")
+        self._scrollregion_job: str | None = None
 
         self.canvas.pack(side="left", fill="both", expand=True)
         self.vscroll.pack(side="right", fill="y")
@@ -22,20 +75,21 @@ class ScrollableFrame(ttk.Frame):
         self.inner.bind("<Configure>", self._on_inner_configure)
         self.canvas.bind("<Configure>", self._on_canvas_configure)
 
-        # mouse wheel support
-        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)      # Windows
-        self.canvas.bind_all("<Button-4>", self._on_mousewheel_linux)  # Linux up
-        self.canvas.bind_all("<Button-5>", self._on_mousewheel_linux)  # Linux down
+        # mouse wheel support, scoped to this frame
+        self._wheel = WheelScroller(self, self.canvas)
 
     def _on_inner_configure(self, _e=None):
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        # coalesce bursts of child resizes into one scrollregion update
+        if self._scrollregion_job is None:
+            self._scrollregion_job = self.after_idle(self._update_scrollregion)
+
+    def _update_scrollregion(self):
+        self._scrollregion_job = None
+        # inner frame is the only canvas item: its requested size is the extent
+        w = self.inner.winfo_reqwidth()
+        h = self.inner.winfo_reqheight()
+        self.canvas.configure(scrollregion=(0, 0, w, h))
 
     def _on_canvas_configure(self, _e=None):
         # make inner frame width follow canvas width
         self.canvas.itemconfigure(self._win, width=self.canvas.winfo_width())
-
-    def _on_mousewheel(self, e):
-        self.canvas.yview_scroll(int(-1 * (e.delta / 120)), "units")
-
-    def _on_mousewheel_linux(self, e):
-        self.canvas.yview_scroll(-1 if e.num == 4 else 1, "units")
@@ -1,7 +1,11 @@
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
+import hashlib
 import io
+from collections import OrderedDict
+
+from PIL import Image
 
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
@@ -9,6 +13,127 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 
 
+# shared by every row of export_match_results_table_format (built once, not per match)
+_NORMAL_STYLE = getSampleStyleSheet()["Normal"]
+_TITLE_STYLE = ParagraphStyle(name="CenteredTitle", fontSize=14, alignment=TA_CENTER, spaceAfter=20)
+_MATCH_TABLE_STYLE = TableStyle([
+    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+READER_CACHE_MAX = 64
+JPEG_QUALITY = 85
+
+
+def _cached_image_reader(cache, image_bytes, max_size):
+    """
+    (ImageReader, mask) for image_bytes, memoized by content digest in an LRU OrderedDict.
+    Images larger than max_size (2x the display box, ~144 dpi) are downscaled first so
+    the PDF doesn't embed and compress full-resolution pixels; smaller ones are kept as-is.
+    """
+    key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+    hit = cache.get(key)
+    if hit is not None:
+        cache.move_to_end(key)
+        return hit
+    pil = Image.open(io.BytesIO(image_bytes))
+    source_format = pil.format
+    resized = pil.width > max_size[0] or pil.height > max_size[1]
+    if resized:
+        pil.thumbnail(max_size, Image.LANCZOS)
+    has_alpha = pil.mode in ("RGBA", "LA") or (pil.mode == "P" and "transparency" in pil.info)
+    if has_alpha:
+        # only alpha images keep the lossless (Flate) path
+        hit = (ImageReader(pil), "auto")
+    elif source_format == "JPEG" and not resized:
+        # embedded as-is (/DCTDecode): no decode, no re-encode
+        hit = (ImageReader(io.BytesIO(image_bytes)), None)
+    else:
+        # opaque images go in as JPEG too, so nothing has to pass through zlib
+        buf = io.BytesIO()
+        pil.convert("L" if pil.mode in ("1", "L") else "RGB").save(buf, "JPEG", quality=JPEG_QUALITY)
+        buf.seek(0)
+        hit = (ImageReader(buf), None)
+    cache[key] = hit
+    if len(cache) > READER_CACHE_MAX:
+        cache.popitem(last=False)
+    return hit
+
+
+BODY_X = 100     # description / item lines are indented under the labels
+LABEL_X = 80
+BODY_LEADING = 18
+LABEL_LEADING = 20
+
+
+def _draw_lines(c, t, lines, y_text, page_top, bottom=50):
+    """
+    Append body lines to TextObject t, continuing on a new page (and a new
+    TextObject) when the bottom margin is reached. Returns (t, y below the last line).
+    """
+    for line in lines:
+        if y_text < bottom:
+            c.drawText(t)
+            c.showPage()
+            y_text = page_top
+            t = c.beginText(BODY_X, y_text)
+            t.setFont("Helvetica", 11)
+            t.setLeading(BODY_LEADING)
+        t.textLine(line)
+        y_text -= BODY_LEADING
+    return t, y_text
+
+
+def _render_block_text(c, block, y_text, page_top):
+    """
+    Labels, description and Word item of one block as a single text object per page:
+    one BT/ET, font switches only between label and body runs, line advance by leading.
+    """
+    catalog_text = ", ".join(block.get("codes", [])) or "N/A"
+    labels = (
+        f"Page: {block['page']}",
+        f"Catalog code: {catalog_text}",
+        f"Product Group: {block.get('product_group', 'N/A')}",
+        f"Brand: {block.get('brand', 'N/A')}",
+        "Description:",
+    )
+    t = c.beginText(LABEL_X, y_text)
+    t.setFont("Helvetica-Bold", 11)
+    t.setLeading(LABEL_LEADING)
+    for label in labels:
+        t.textLine(label)
+    y_text -= LABEL_LEADING * len(labels)
+
+    # associated text lines as description, indented for cleaner layout
+    t.setFont("Helvetica", 11)
+    t.setLeading(BODY_LEADING)
+    t.moveCursor(BODY_X - LABEL_X, 0)
+    t, y_text = _draw_lines(c, t, (line.strip() for line in block["texts"]), y_text, page_top)
+
+    # Word Item Info
+    if "item" in block and isinstance(block["item"], dict):
+        t.moveCursor(LABEL_X - BODY_X, 30)  # dedent, 30pt gap
+        y_text -= 30
+        t.setFont("Helvetica-Bold", 11)
+        t.setLeading(LABEL_LEADING)
+        t.textLine("Word Item Description:")
+        y_text -= LABEL_LEADING
+
+        t.setFont("Helvetica", 11)
+        t.setLeading(BODY_LEADING)
+        t.moveCursor(BODY_X - LABEL_X, 0)
+        item_lines = (
+            f"{key.capitalize()}: {value}"
+            for key, value in block["item"].items()
+            if value and str(value).strip()
+        )
+        t, y_text = _draw_lines(c, t, item_lines, y_text, page_top)
+
+    c.drawText(t)
+    return y_text
+
+
 def export_product_blocks_to_pdf(blocks, output_path):
     """
     blocks: list of dicts with keys: page, image_index, image_bytes, texts (list of strings)
@@ -20,11 +145,15 @@ def export_product_blocks_to_pdf(blocks, output_path):
     max_image_height = 300
     top_margin = 100
 
+    # shared product photos recur across blocks: decode each distinct image once
+    reader_cache = OrderedDict()
+
     for block in blocks:
         # Centered image at top with preserved aspect ratio
         try:
-            img_data = io.BytesIO(block["image_bytes"])
-            img = ImageReader(img_data)
+            img, mask = _cached_image_reader(
+                reader_cache, block["image_bytes"], (max_image_width * 2, max_image_height * 2)
+            )
             img_width, img_height = img.getSize()
 
             scale = min(max_image_width / img_width, max_image_height / img_height, 1.0)
@@ -34,62 +163,12 @@ def export_product_blocks_to_pdf(blocks, output_path):
             x = (page_w - display_width) / 2
             y = page_h - top_margin - display_height
 
-            c.drawImage(img, x, y, width=display_width, height=display_height, preserveAspectRatio=True)
+            c.drawImage(img, x, y, width=display_width, height=display_height, preserveAspectRatio=True, mask=mask)
         except:
             c.setFont("Helvetica", 10)
             c.drawString(100, page_h - top_margin, "[Image Error]")
 
-        # Add metadata: Page
-        y_text = y - 30
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(80, y_text, f"Page: {block['page']}")
-
-        # Add Catalog Code
-        y_text -= 20
-        catalog_text = ", ".join(block.get("codes", [])) or "N/A"
-        c.drawString(80, y_text, f"Catalog code: {catalog_text}")
-
-        # Add product group (if available)
-        y_text -= 20
-        product_group = block.get("product_group", "N/A")
-        c.drawString(80, y_text, f"Product Group: {product_group}")
-
-        # Add Brand (if available)
-        y_text -= 20
-        brand_text = block.get("brand", "N/A")
-        c.drawString(80, y_text, f"Brand: {brand_text}")
-
-        # Add Description Title
-        y_text -= 20
-        c.drawString(80, y_text, "Description:")
-        y_text -= 20
-
-        # Add associated text lines as description
-        c.setFont("Helvetica", 11)
-        for line in block["texts"]:
-            if y_text < 50:
-                c.showPage()
-                y_text = page_h - top_margin
-                c.setFont("Helvetica", 11)
-            c.drawString(100, y_text, line.strip())  # Indent for cleaner layout
-            y_text -= 18
-            
-        # Word Item Info
-        if "item" in block and isinstance(block["item"], dict):
-            y_text -= 30
-            c.setFont("Helvetica-Bold", 11)
-            c.drawString(80, y_text, "Word Item Description:")
-            c.setFont("Helvetica", 11)
-            y_text -= 20
-
-            for key, value in block["item"].items():
-                if value and str(value).strip():
-                    if y_text < 50:
-                        c.showPage()
-                        y_text = page_h - top_margin
-                        c.setFont("Helvetica", 11)
-                    c.drawString(100, y_text, f"{key.capitalize()}: {value}")
-                    y_text -= 18
+        _render_block_text(c, block, y - 30, page_h - top_margin)
 
         c.showPage()
 
@@ -102,12 +181,10 @@ def export_match_results_table_format(matches, output_path):
     Each row = (catalog code, page number)
     """
     doc = SimpleDocTemplate(output_path, pagesize=A4)
-    styles = getSampleStyleSheet()
     content = []
 
     # Title
-    title_style = ParagraphStyle(name="CenteredTitle", fontSize=14, alignment=TA_CENTER, spaceAfter=20)
-    content.append(Paragraph("Tài liệu tham chiếu", title_style))
+    content.append(Paragraph("Tài liệu tham chiếu", _TITLE_STYLE))
     content.append(Spacer(1, 12))
 
     # Build each match block
@@ -119,16 +196,11 @@ def export_match_results_table_format(matches, output_path):
         page = block["page"] if block else "N/A"
 
         table_data = [
-            [Paragraph(f"<b>Catalogue mã hàng:</b><br/>{code}", styles["Normal"])],
-            [Paragraph(f"<b>Trang số:</b> {page}", styles["Normal"])]
+            [Paragraph(f"<b>Catalogue mã hàng:</b><br/>{code}", _NORMAL_STYLE)],
+            [Paragraph(f"<b>Trang số:</b> {page}", _NORMAL_STYLE)]
         ]
 
-        table = Table(table_data, colWidths=[450])
-        table.setStyle(TableStyle([
-            ('BOX', (0, 0), (-1, -1), 1, colors.black),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
+        table = Table(table_data, colWidths=[450], style=_MATCH_TABLE_STYLE)
 
         content.append(table)
         content.append(Spacer(1, 12))